@@ -1,7 +1,10 @@
 """Module de gestion du lockscreen Windows."""
 
+import ctypes
 import os
-import shutil
+import subprocess
+import tempfile
+import time
 import winreg
 from pathlib import Path
 from typing import Optional
@@ -10,15 +13,68 @@ from ..utils.logger import get_logger
 
 logger = get_logger()
 
+# Liaison directe sur advapi32 pour écrire les REG_SZ: un seul tampon
+# UTF-16 est construit par image au lieu d'un transcodage str->UTF-16
+# par SetValueEx dans winreg
+_advapi32 = ctypes.WinDLL("advapi32", use_last_error=True)
+_RegSetValueExW = _advapi32.RegSetValueExW
+_RegSetValueExW.argtypes = (
+    ctypes.c_void_p,   # hKey
+    ctypes.c_wchar_p,  # lpValueName
+    ctypes.c_ulong,    # Reserved
+    ctypes.c_ulong,    # dwType
+    ctypes.c_void_p,   # lpData
+    ctypes.c_ulong,    # cbData
+)
+_RegSetValueExW.restype = ctypes.c_long
+
 
 class LockscreenManager:
     """Gestionnaire du lockscreen Windows."""
-    
+
+    # Valeurs PersonalizationCSP écrites à chaque set_lockscreen
+    # (les REG_SZ reçoivent le chemin de l'image, le REG_DWORD vaut 1)
+    _CSP_VALUE_SPEC = (
+        ("LockScreenImagePath", winreg.REG_SZ),
+        ("LockScreenImageUrl", winreg.REG_SZ),
+        ("LockScreenImageStatus", winreg.REG_DWORD),
+    )
+
     def __init__(self):
         """Initialise le gestionnaire de lockscreen."""
         self.csp_key_path = r"SOFTWARE\Microsoft\Windows\CurrentVersion\PersonalizationCSP"
         self.windows_screen_folder = Path(r"C:\Windows\Web\Screen")
-    
+        self._screen_folder_ready = False
+
+    @staticmethod
+    def _fast_copy(src: str, dst: str) -> None:
+        """
+        Copie rapide d'un fichier image.
+
+        Utilise CopyFileW (copie en mode noyau, nettement plus rapide que
+        la boucle read/write de shutil pour des JPEG de plusieurs Mo) avec
+        repli sur une boucle readinto à gros tampon si l'API échoue.
+
+        Args:
+            src: Chemin du fichier source
+            dst: Chemin du fichier destination
+        """
+        try:
+            if ctypes.windll.kernel32.CopyFileW(str(src), str(dst), False):
+                return
+        except (AttributeError, OSError):
+            pass
+
+        # Repli: copie Python avec tampon de 1 Mo réutilisé
+        buffer = bytearray(1024 * 1024)
+        view = memoryview(buffer)
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            while True:
+                read = fsrc.readinto(buffer)
+                if not read:
+                    break
+                fdst.write(view[:read])
+
     def set_lockscreen(self, image_path: str) -> bool:
         """
         Définit l'image du lockscreen via PersonalizationCSP.
@@ -36,86 +92,77 @@ class LockscreenManager:
         """
         try:
             image_path = os.path.abspath(image_path)
-            
-            if not os.path.exists(image_path):
-                logger.error(f"Image introuvable pour lockscreen: {image_path}")
-                return False
-            
+
+            # Pas de test d'existence préalable: la copie elle-même sert de
+            # vérification (évite un stat() redondant avant chaque copie)
+
             # S'assurer que le dossier C:\Windows\Web\Screen existe
-            try:
-                self.windows_screen_folder.mkdir(parents=True, exist_ok=True)
-            except PermissionError:
-                logger.error("❌ Droits administrateur requis pour créer le dossier lockscreen")
-                return False
+            # (vérifié une seule fois, la rotation rappelle cette méthode à chaque tick)
+            if not self._screen_folder_ready:
+                try:
+                    self.windows_screen_folder.mkdir(parents=True, exist_ok=True)
+                    self._screen_folder_ready = True
+                except PermissionError:
+                    logger.error("❌ Droits administrateur requis pour créer le dossier lockscreen")
+                    return False
             
             # Copier l'image dans C:\Windows\Web\Screen avec un nom unique basé sur le timestamp
-            import time
             timestamp = int(time.time())
             filename = f"Lockscreen_{timestamp}.jpg"
             lockscreen_image_path = self.windows_screen_folder / filename
             
             try:
-                shutil.copy2(image_path, lockscreen_image_path)
+                self._fast_copy(image_path, lockscreen_image_path)
                 logger.debug(f"Image copiée dans: {lockscreen_image_path}")
             except PermissionError:
                 logger.error("❌ Droits administrateur requis pour copier dans C:\\Windows\\Web\\Screen")
                 return False
+            except FileNotFoundError as e:
+                if e.filename == image_path:
+                    logger.error(f"Image introuvable pour lockscreen: {image_path}")
+                else:
+                    # Le dossier a pu disparaître entre-temps, re-vérifier au prochain appel
+                    self._screen_folder_ready = False
+                    logger.error(f"Dossier lockscreen introuvable: {self.windows_screen_folder}")
+                return False
             
             # Mettre à jour le registre via PersonalizationCSP (HKEY_LOCAL_MACHINE)
             try:
-                # Créer la clé PersonalizationCSP si elle n'existe pas
-                try:
-                    key = winreg.OpenKey(
-                        winreg.HKEY_LOCAL_MACHINE,
-                        self.csp_key_path,
-                        0,
-                        winreg.KEY_READ
-                    )
-                    winreg.CloseKey(key)
-                    logger.debug("Clé PersonalizationCSP existe déjà")
-                except FileNotFoundError:
-                    # La clé n'existe pas, la créer
-                    key = winreg.CreateKey(winreg.HKEY_LOCAL_MACHINE, self.csp_key_path)
-                    winreg.CloseKey(key)
-                    logger.debug("Clé PersonalizationCSP créée")
-                
-                # Ouvrir la clé en écriture
-                key = winreg.OpenKey(
+                # CreateKeyEx crée la clé si nécessaire et l'ouvre en écriture
+                # en un seul aller-retour registre (pas de sonde d'existence)
+                key = winreg.CreateKeyEx(
                     winreg.HKEY_LOCAL_MACHINE,
                     self.csp_key_path,
                     0,
                     winreg.KEY_SET_VALUE
                 )
-                
-                # Définir les valeurs de registre
-                lockscreen_path_str = str(lockscreen_image_path)
-                
-                winreg.SetValueEx(
-                    key,
-                    "LockScreenImagePath",
-                    0,
-                    winreg.REG_SZ,
-                    lockscreen_path_str
-                )
-                
-                winreg.SetValueEx(
-                    key,
-                    "LockScreenImageUrl",
-                    0,
-                    winreg.REG_SZ,
-                    lockscreen_path_str
-                )
-                
-                winreg.SetValueEx(
-                    key,
-                    "LockScreenImageStatus",
-                    0,
-                    winreg.REG_DWORD,
-                    1
-                )
-                
-                winreg.CloseKey(key)
+
+                try:
+                    # Définir les valeurs de registre: le chemin est transcodé
+                    # en UTF-16 une seule fois et réutilisé pour les deux REG_SZ
+                    lockscreen_path_str = str(lockscreen_image_path)
+                    path_buffer = ctypes.create_unicode_buffer(lockscreen_path_str)
+                    path_bytes = ctypes.sizeof(path_buffer)
+
+                    for value_name, value_type in self._CSP_VALUE_SPEC:
+                        if value_type == winreg.REG_SZ:
+                            result = _RegSetValueExW(
+                                key.handle,
+                                value_name,
+                                0,
+                                winreg.REG_SZ,
+                                ctypes.byref(path_buffer),
+                                path_bytes
+                            )
+                            if result != 0:
+                                raise ctypes.WinError(result)
+                        else:
+                            winreg.SetValueEx(key, value_name, 0, value_type, 1)
+                finally:
+                    winreg.CloseKey(key)
+
                 logger.info(f"✓ Lockscreen défini via PersonalizationCSP: {os.path.basename(image_path)}")
+                self._cleanup_old_lockscreens()
                 return True
                 
             except PermissionError:
@@ -127,6 +174,24 @@ class LockscreenManager:
             logger.error(f"Erreur lors de la définition du lockscreen: {e}", exc_info=True)
             return False
     
+    def _cleanup_old_lockscreens(self) -> None:
+        """
+        Supprime les anciennes images Lockscreen_<timestamp>.jpg.
+
+        Chaque rotation dépose un nouveau fichier dans C:\\Windows\\Web\\Screen ;
+        sans nettoyage le dossier grossit indéfiniment. On conserve les deux
+        fichiers les plus récents (l'actuel + le précédent en secours).
+        """
+        try:
+            old_files = sorted(self.windows_screen_folder.glob("Lockscreen_*.jpg"))
+            for old_file in old_files[:-2]:
+                try:
+                    os.unlink(old_file)
+                except PermissionError:
+                    logger.debug(f"Impossible de supprimer l'ancien lockscreen: {old_file}")
+        except OSError as e:
+            logger.debug(f"Nettoyage des anciens lockscreens impossible: {e}")
+
     def remove_lockscreen(self) -> bool:
         """
         Supprime la configuration PersonalizationCSP pour rendre le contrôle à l'utilisateur.
@@ -159,17 +224,67 @@ class LockscreenManager:
             logger.error(f"Erreur lors de la suppression de PersonalizationCSP: {e}", exc_info=True)
             return False
     
+    @staticmethod
+    def _apply_reg_script(script: str) -> bool:
+        """
+        Applique un script .reg en une seule transaction via reg.exe.
+
+        Pour les chemins de première configuration qui posent plusieurs
+        valeurs d'un coup, un import .reg remplace N allers-retours
+        python->winreg par une seule transaction noyau.
+
+        Args:
+            script: Contenu du script (sans l'en-tête "Windows Registry Editor")
+
+        Returns:
+            True si l'import a réussi
+        """
+        reg_path = None
+        try:
+            content = "Windows Registry Editor Version 5.00\r\n\r\n" + script
+            with tempfile.NamedTemporaryFile(
+                mode='wb', suffix='.reg', delete=False
+            ) as reg_file:
+                reg_file.write(content.encode('utf-16'))
+                reg_path = reg_file.name
+
+            result = subprocess.run(
+                ["reg.exe", "import", reg_path],
+                capture_output=True,
+                creationflags=getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+            )
+            return result.returncode == 0
+        except OSError as e:
+            logger.debug(f"Import .reg impossible: {e}")
+            return False
+        finally:
+            if reg_path:
+                try:
+                    os.unlink(reg_path)
+                except OSError:
+                    pass
+
     def disable_windows_spotlight(self) -> bool:
         """
         Désactive Windows Spotlight pour permettre le lockscreen personnalisé.
-        
+
         Returns:
             True si succès, False sinon
         """
         try:
             # Clé pour désactiver Windows Spotlight
             personalization_key = r"SOFTWARE\Policies\Microsoft\Windows\Personalization"
-            
+
+            # Voie rapide: poser les deux valeurs en une seule transaction
+            if self._apply_reg_script(
+                f"[HKEY_CURRENT_USER\\{personalization_key}]\r\n"
+                "\"NoLockScreen\"=dword:00000000\r\n"
+                "\"LockScreenOverlaysDisabled\"=dword:00000001\r\n"
+            ):
+                logger.info("✓ Windows Spotlight désactivé pour le lockscreen")
+                return True
+
+            # Repli: écritures winreg valeur par valeur
             try:
                 key = winreg.CreateKey(winreg.HKEY_CURRENT_USER, personalization_key)
                 
@@ -198,18 +313,20 @@ class LockscreenManager:
         """
         try:
             key = winreg.OpenKey(
-                winreg.HKEY_CURRENT_USER,
-                self.registry_key_path,
+                winreg.HKEY_LOCAL_MACHINE,
+                self.csp_key_path,
                 0,
                 winreg.KEY_READ
             )
-            
-            lockscreen_image, _ = winreg.QueryValueEx(key, "LockScreenImage")
-            winreg.CloseKey(key)
-            
+
+            try:
+                lockscreen_image, _ = winreg.QueryValueEx(key, "LockScreenImagePath")
+            finally:
+                winreg.CloseKey(key)
+
             return lockscreen_image if lockscreen_image else None
-            
-        except Exception as e:
+
+        except (FileNotFoundError, OSError) as e:
             logger.debug(f"Impossible de récupérer le lockscreen actuel: {e}")
             return None
 
@@ -1,489 +1,827 @@
-"""Module de planification de la rotation des fonds d'écran."""
-
-import random
-import threading
-import time
-from pathlib import Path
-from typing import Callable, Dict, List, Optional
-
-from ..utils.logger import get_logger
-
-logger = get_logger()
-
-
-class RotationScheduler:
-    """Planificateur de rotation des fonds d'écran."""
-    
-    def __init__(self, delay_seconds: int = 900, smart_cache_manager=None):
-        """
-        Initialise le planificateur.
-        
-        Args:
-            delay_seconds: Délai entre chaque rotation en secondes
-            smart_cache_manager: Gestionnaire de cache intelligent pour le téléchargement à la demande
-        """
-        self.delay_seconds = delay_seconds
-        self.is_running = False
-        self.is_paused = False
-        self.thread: Optional[threading.Thread] = None
-        self.playlists: Dict[int, List[str]] = {}  # {screen_id: [image_paths]}
-        self.theme_configs: Dict[int, Dict] = {}  # {screen_id: {theme, images_metadata}}
-        self.current_indices: Dict[int, int] = {}  # {screen_id: current_index}
-        self.current_wallpapers: Dict[int, str] = {}  # {screen_id: current_filename}
-        self.current_themes: Dict[int, str] = {}  # {screen_id: current_theme_name}
-        self.random_mode = True
-        self.callback: Optional[Callable] = None
-        self.smart_cache = smart_cache_manager
-        self._stop_event = threading.Event()
-    
-    def set_playlist(self, screen_id: int, image_paths: List[str]) -> None:
-        """
-        Définit la playlist pour un écran (méthode legacy pour compatibilité).
-        
-        Args:
-            screen_id: ID de l'écran
-            image_paths: Liste des chemins d'images
-        """
-        self.playlists[screen_id] = image_paths.copy()
-        self.current_indices[screen_id] = 0
-    
-    def set_theme_config(self, screen_id: int, theme_name: str, images_metadata: List[Dict]) -> None:
-        """
-        Définit la configuration du thème pour un écran (avec téléchargement progressif).
-        
-        Args:
-            screen_id: ID de l'écran
-            theme_name: Nom du thème
-            images_metadata: Liste des métadonnées d'images (avec 'url', 'filename', etc.)
-        """
-        self.theme_configs[screen_id] = {
-            'theme': theme_name,
-            'images': images_metadata.copy()
-        }
-        self.current_indices[screen_id] = 0
-        logger.info(f"Configuration du thème '{theme_name}' pour écran {screen_id}: {len(images_metadata)} images disponibles")
-    
-    def set_random_mode(self, enabled: bool) -> None:
-        """
-        Active ou désactive le mode aléatoire.
-        
-        Args:
-            enabled: True pour activer le mode aléatoire
-        """
-        self.random_mode = enabled
-        
-        # Réorganiser les playlists existantes
-        if enabled:
-            for screen_id in self.playlists:
-                random.shuffle(self.playlists[screen_id])
-                self.current_indices[screen_id] = 0
-    
-    def set_delay(self, seconds: int) -> None:
-        """
-        Définit le délai de rotation.
-        
-        Args:
-            seconds: Délai en secondes
-        """
-        self.delay_seconds = seconds
-        logger.info(f"Délai de rotation défini à {seconds} secondes")
-    
-    def set_callback(self, callback: Callable[[int, str], None]) -> None:
-        """
-        Définit la fonction de callback appelée lors de chaque rotation.
-        
-        Args:
-            callback: Fonction callback(screen_id, image_path)
-        """
-        self.callback = callback
-    
-    def _extract_theme_from_path(self, image_path: str) -> str:
-        """
-        Extrait le nom du thème depuis le chemin de l'image.
-        
-        Args:
-            image_path: Chemin de l'image (ex: data/wallpapers/Earth/image.jpg)
-            
-        Returns:
-            Nom du thème ou "Unknown"
-        """
-        try:
-            path_parts = Path(image_path).parts
-            # Chercher "wallpapers" dans le chemin
-            if "wallpapers" in path_parts:
-                wallpapers_index = path_parts.index("wallpapers")
-                if wallpapers_index + 1 < len(path_parts):
-                    return path_parts[wallpapers_index + 1]
-            return "Unknown"
-        except Exception:
-            return "Unknown"
-    
-    def get_next_image(self, screen_id: int) -> Optional[str]:
-        """
-        Récupère la prochaine image pour un écran (évite les doublons entre écrans).
-        
-        Args:
-            screen_id: ID de l'écran
-            
-        Returns:
-            Chemin de l'image suivante ou None
-        """
-        if screen_id not in self.playlists or not self.playlists[screen_id]:
-            return None
-        
-        playlist = self.playlists[screen_id]
-        current_index = self.current_indices.get(screen_id, 0)
-        
-        if current_index >= len(playlist):
-            # Recommencer la playlist
-            current_index = 0
-            if self.random_mode:
-                random.shuffle(playlist)
-        
-        # Récupérer les images et thèmes actuellement affichés sur les autres écrans
-        currently_displayed_filenames = set()
-        currently_displayed_themes = set()
-        for other_screen_id, current_filename in self.current_wallpapers.items():
-            if other_screen_id != screen_id:
-                currently_displayed_filenames.add(current_filename)
-        
-        for other_screen_id, current_theme in self.current_themes.items():
-            if other_screen_id != screen_id:
-                currently_displayed_themes.add(current_theme)
-        
-        if currently_displayed_themes:
-            logger.info(f"📋 Thèmes actuellement affichés sur d'autres écrans: {currently_displayed_themes}")
-        
-        # Essayer de trouver une image différente de celles affichées sur d'autres écrans
-        # ET d'un thème différent (pour le mode "Tous les thèmes")
-        max_attempts = len(playlist)
-        for attempt in range(max_attempts):
-            image_path = playlist[current_index]
-            filename = Path(image_path).name
-            theme_name = self._extract_theme_from_path(image_path)
-            
-            # Vérifier que l'image n'est pas affichée sur un autre écran
-            if filename in currently_displayed_filenames:
-                current_index = (current_index + 1) % len(playlist)
-                logger.debug(f"Image {filename} déjà sur un autre écran, essai suivante")
-                continue
-            
-            # Vérifier que le thème n'est pas affiché sur un autre écran (pour "Tous les thèmes")
-            if theme_name in currently_displayed_themes:
-                current_index = (current_index + 1) % len(playlist)
-                logger.info(f"⚠️ Thème '{theme_name}' déjà affiché sur un autre écran, recherche d'un autre thème...")
-                continue
-            
-            # Image et thème OK, on peut l'utiliser
-            self.current_indices[screen_id] = current_index + 1
-            logger.info(f"✓ Thème '{theme_name}' sélectionné pour écran {screen_id} (différent des autres écrans)")
-            return image_path
-        
-        # Si aucune image ne satisfait les critères, prendre n'importe laquelle
-        logger.warning(f"⚠️ Impossible de trouver une image sans doublon de thème, autorisation d'un doublon temporaire")
-        image_path = playlist[current_index]
-        self.current_indices[screen_id] = current_index + 1
-        
-        return image_path
-    
-    def start(self) -> None:
-        """Démarre la rotation automatique."""
-        if self.is_running:
-            logger.warning("La rotation est déjà en cours")
-            return
-        
-        self.is_running = True
-        self.is_paused = False
-        self._stop_event.clear()
-        
-        self.thread = threading.Thread(target=self._rotation_loop, daemon=True)
-        self.thread.start()
-        
-        logger.info(f"Rotation démarrée (délai: {self.delay_seconds}s)")
-    
-    def stop(self) -> None:
-        """Arrête la rotation automatique."""
-        if not self.is_running:
-            return
-        
-        self.is_running = False
-        self._stop_event.set()
-        
-        if self.thread:
-            self.thread.join(timeout=2)
-        
-        logger.info("Rotation arrêtée")
-    
-    def pause(self) -> None:
-        """Met en pause la rotation."""
-        if not self.is_running:
-            return
-        
-        self.is_paused = True
-        logger.info("Rotation mise en pause")
-    
-    def resume(self) -> None:
-        """Reprend la rotation."""
-        if not self.is_running or not self.is_paused:
-            return
-        
-        self.is_paused = False
-        logger.info("Rotation reprise")
-    
-    def toggle_pause(self) -> bool:
-        """
-        Bascule entre pause et lecture.
-        
-        Returns:
-            True si en pause après le toggle
-        """
-        if self.is_paused:
-            self.resume()
-        else:
-            self.pause()
-        return self.is_paused
-    
-    def rotate_now(self) -> None:
-        """Force une rotation immédiate."""
-        logger.info("Rotation forcée")
-        self._perform_rotation()
-    
-    def _rotation_loop(self) -> None:
-        """Boucle principale de rotation (exécutée dans un thread)."""
-        while self.is_running:
-            # Si en pause, attendre un peu et continuer
-            if self.is_paused:
-                if self._stop_event.wait(timeout=1):
-                    break
-                continue
-            
-            # Attendre le délai (avec possibilité d'interruption)
-            logger.debug(f"Attente de {self.delay_seconds}s avant prochaine rotation")
-            if self._stop_event.wait(timeout=self.delay_seconds):
-                break
-            
-            # Effectuer la rotation
-            logger.debug("Déclenchement rotation automatique")
-            self._perform_rotation()
-    
-    def _perform_rotation(self) -> None:
-        """Effectue une rotation pour tous les écrans actifs."""
-        if not self.callback:
-            logger.warning("Aucun callback défini pour la rotation")
-            return
-        
-        if not self.playlists and not self.theme_configs:
-            logger.warning("Aucune configuration définie pour la rotation")
-            return
-        
-        # Combiner les deux systèmes
-        screens_to_rotate = set(list(self.playlists.keys()) + list(self.theme_configs.keys()))
-        
-        logger.debug(f"Rotation en cours pour {len(screens_to_rotate)} écran(s)")
-        
-        for screen_id in screens_to_rotate:
-            try:
-                next_image_path = None
-                
-                # Essayer d'abord le nouveau système avec téléchargement progressif
-                if screen_id in self.theme_configs and self.smart_cache:
-                    next_image_path = self._get_next_image_with_download(screen_id)
-                
-                # Fallback sur l'ancien système si le nouveau échoue ou n'est pas configuré
-                if not next_image_path and screen_id in self.playlists:
-                    next_image_path = self.get_next_image(screen_id)
-                
-                if next_image_path:
-                    # Vérifier que le fichier existe
-                    if Path(next_image_path).exists():
-                        filename = Path(next_image_path).name
-                        theme_from_path = self._extract_theme_from_path(next_image_path)
-                        
-                        logger.debug(f"Application image écran {screen_id}: {filename} (thème: {theme_from_path})")
-                        self.callback(screen_id, next_image_path)
-                        
-                        # Enregistrer l'image et le thème actuellement affichés sur cet écran
-                        self.current_wallpapers[screen_id] = filename
-                        self.current_themes[screen_id] = theme_from_path
-                        
-                        # Marquer l'image comme affichée dans le cache intelligent
-                        if self.smart_cache and screen_id in self.theme_configs:
-                            theme_name = self.theme_configs[screen_id]['theme']
-                            self.smart_cache.mark_as_displayed(theme_name, next_image_path)
-                            logger.debug(f"Image marquée comme affichée: {filename}")
-                    else:
-                        logger.warning(f"Image introuvable: {next_image_path}")
-                else:
-                    logger.warning(f"Aucune image disponible pour l'écran {screen_id}")
-                
-            except Exception as e:
-                logger.error(f"Erreur lors de la rotation pour l'écran {screen_id}: {e}", exc_info=True)
-    
-    def _get_next_image_with_download(self, screen_id: int) -> Optional[str]:
-        """
-        Récupère la prochaine image avec téléchargement automatique si nécessaire.
-        
-        Args:
-            screen_id: ID de l'écran
-            
-        Returns:
-            Chemin local de l'image, ou None si échec
-        """
-        if screen_id not in self.theme_configs:
-            return None
-        
-        theme_config = self.theme_configs[screen_id]
-        theme_name = theme_config['theme']
-        images_metadata = theme_config['images']
-        
-        if not images_metadata:
-            logger.warning(f"Aucune image disponible pour le thème '{theme_name}'")
-            return None
-        
-        # Récupérer les images et thèmes actuellement affichés sur les autres écrans
-        currently_displayed_on_other_screens = set()
-        currently_displayed_themes_on_other_screens = set()
-        
-        for other_screen_id, current_filename in self.current_wallpapers.items():
-            if other_screen_id != screen_id:  # Exclure l'écran actuel
-                currently_displayed_on_other_screens.add(current_filename)
-        
-        for other_screen_id, current_theme in self.current_themes.items():
-            if other_screen_id != screen_id:
-                currently_displayed_themes_on_other_screens.add(current_theme)
-        
-        logger.debug(f"Images actuellement affichées sur d'autres écrans: {currently_displayed_on_other_screens}")
-        logger.debug(f"Thèmes actuellement affichés sur d'autres écrans: {currently_displayed_themes_on_other_screens}")
-        
-        # Filtrer les images déjà affichées pour ce cycle ET celles affichées sur d'autres écrans
-        undisplayed_images = []
-        for img in images_metadata:
-            filename = img.get('filename', '')
-            if not filename:
-                continue
-            
-            # Vérifier si l'image est affichée sur un autre écran
-            if filename in currently_displayed_on_other_screens:
-                logger.debug(f"Image {filename} déjà affichée sur un autre écran, ignorée")
-                continue
-            
-            # Vérifier si l'image a déjà été affichée dans ce cycle
-            if self.smart_cache:
-                is_displayed = self.smart_cache.is_image_displayed(theme_name, filename)
-                if not is_displayed:
-                    undisplayed_images.append(img)
-            else:
-                undisplayed_images.append(img)
-        
-        logger.debug(f"Images non affichées pour '{theme_name}': {len(undisplayed_images)}/{len(images_metadata)}")
-        
-        # Si toutes les images non affichées sont sur d'autres écrans, autoriser les doublons
-        if not undisplayed_images:
-            # Vérifier si c'est parce que le cycle est terminé ou juste des doublons
-            total_undisplayed = sum(1 for img in images_metadata 
-                                   if not self.smart_cache.is_image_displayed(theme_name, img.get('filename', ''))
-                                   if self.smart_cache)
-            
-            if total_undisplayed == 0:
-                # Cycle vraiment terminé
-                logger.info(f"🔄 Cycle terminé pour '{theme_name}' ! Réinitialisation...")
-                if self.smart_cache:
-                    self.smart_cache.reset_cycle(theme_name)
-                # Toutes les images sont maintenant disponibles à nouveau
-                undisplayed_images = [img for img in images_metadata 
-                                     if img.get('filename') not in currently_displayed_on_other_screens]
-                logger.info(f"Nouveau cycle commencé, {len(undisplayed_images)} images disponibles")
-            else:
-                # Des images sont dispo mais affichées sur d'autres écrans
-                # Dans ce cas, on autorise un doublon temporaire
-                logger.warning(f"Toutes les images non affichées sont sur d'autres écrans, sélection parmi toutes")
-                undisplayed_images = [img for img in images_metadata 
-                                     if not self.smart_cache.is_image_displayed(theme_name, img.get('filename', ''))
-                                     if self.smart_cache]
-                
-                # Si vraiment aucune image dispo, autoriser n'importe quelle image
-                if not undisplayed_images:
-                    undisplayed_images = images_metadata.copy()
-        
-        # Sélectionner l'image suivante parmi les images non affichées
-        if self.random_mode:
-            # Mode aléatoire
-            image_metadata = random.choice(undisplayed_images)
-        else:
-            # Mode séquentiel
-            current_index = self.current_indices.get(screen_id, 0)
-            image_metadata = undisplayed_images[current_index % len(undisplayed_images)]
-            self.current_indices[screen_id] = (current_index + 1) % len(undisplayed_images)
-        
-        filename = image_metadata.get('filename', '')
-        url = image_metadata.get('url', '')
-        
-        if not filename or not url:
-            logger.error(f"Métadonnées invalides pour l'image: {image_metadata}")
-            return None
-        
-        logger.debug(f"Image sélectionnée pour écran {screen_id}: {filename}")
-        
-        # Vérifier si l'image est déjà téléchargée localement
-        if self.smart_cache:
-            local_path = self.smart_cache.get_image_local_path(theme_name, filename)
-            
-            if local_path and Path(local_path).exists():
-                logger.debug(f"Image déjà en cache: {filename}")
-                # Ne pas marquer ici, ce sera fait après l'application du fond d'écran
-                return local_path
-            
-            # Image pas encore téléchargée, télécharger maintenant
-            logger.info(f"📥 Téléchargement de l'image {filename} pour le thème '{theme_name}'...")
-            
-            try:
-                downloaded_path = self.smart_cache.download_single_image(
-                    theme_name=theme_name,
-                    image_url=url,
-                    filename=filename
-                )
-                
-                if downloaded_path and Path(downloaded_path).exists():
-                    logger.info(f"✓ Image téléchargée avec succès: {filename}")
-                    # Ne pas marquer ici, ce sera fait après l'application du fond d'écran
-                    return downloaded_path
-                else:
-                    logger.error(f"Échec du téléchargement de {filename}")
-                    return None
-                    
-            except Exception as e:
-                logger.error(f"Erreur lors du téléchargement de {filename}: {e}", exc_info=True)
-                return None
-        else:
-            logger.error("SmartCacheManager non disponible pour le téléchargement")
-            return None
-    
-    def get_playlist_info(self, screen_id: int) -> Dict:
-        """
-        Récupère les informations de la playlist d'un écran.
-        
-        Args:
-            screen_id: ID de l'écran
-            
-        Returns:
-            Dictionnaire avec les informations
-        """
-        playlist = self.playlists.get(screen_id, [])
-        current_index = self.current_indices.get(screen_id, 0)
-        
-        return {
-            'total_images': len(playlist),
-            'current_index': current_index,
-            'remaining': len(playlist) - current_index if playlist else 0
-        }
-    
-    def is_active(self) -> bool:
-        """
-        Vérifie si la rotation est active.
-        
-        Returns:
-            True si active (démarrée et non en pause)
-        """
-        return self.is_running and not self.is_paused
-
-
+"""Module de planification de la rotation des fonds d'écran."""
+
+import asyncio
+import concurrent.futures
+import functools
+import logging
+import os
+import random
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from ..utils.logger import get_logger
+
+logger = get_logger()
+
+# Résultat d'une décision de rotation: le chemin accompagné du nom de
+# fichier et du thème déjà calculés, pour éviter de les redériver en aval
+NextImage = namedtuple('NextImage', 'path filename theme')
+
+
+@functools.lru_cache(maxsize=4096)
+def _extract_image_meta(image_path: str) -> tuple:
+    """
+    Extrait (nom de fichier, thème) d'un chemin d'image, avec mémoïsation.
+
+    Les mêmes chemins reviennent à chaque cycle de rotation: le cache LRU
+    évite de refaire le découpage pathlib à chaque décision.
+
+    Args:
+        image_path: Chemin de l'image (ex: data/wallpapers/Earth/image.jpg)
+
+    Returns:
+        Tuple (filename, theme) — theme vaut "Unknown" si introuvable
+    """
+    try:
+        # Découpage purement chaîne: pas d'objet Path, la structure
+        # .../wallpapers/<theme>/<fichier> est fixe
+        normalized = image_path.replace('\\', '/')
+        filename = normalized.rsplit('/', 1)[-1]
+        if normalized.startswith('wallpapers/'):
+            tail = normalized[len('wallpapers/'):]
+        else:
+            tail = normalized.partition('/wallpapers/')[2]
+        if tail:
+            theme = tail.split('/', 1)[0]
+            if theme:
+                return filename, theme
+        return filename, "Unknown"
+    except Exception:
+        return image_path, "Unknown"
+
+
+class RotationScheduler:
+    """Planificateur de rotation des fonds d'écran."""
+    
+    def __init__(self, delay_seconds: int = 900, smart_cache_manager=None):
+        """
+        Initialise le planificateur.
+        
+        Args:
+            delay_seconds: Délai entre chaque rotation en secondes
+            smart_cache_manager: Gestionnaire de cache intelligent pour le téléchargement à la demande
+        """
+        self.delay_seconds = delay_seconds
+        self.is_running = False
+        self.is_paused = False
+        self.thread: Optional[threading.Thread] = None
+        # Les IDs d'écran sont de petits entiers denses (0..N-1): listes
+        # contiguës indexées par screen_id plutôt que dicts sur le chemin chaud
+        self.playlists: List[Optional[List[str]]] = []  # [screen_id] -> [image_paths]
+        self.theme_configs: Dict[int, Dict] = {}  # {screen_id: {theme, images_metadata}}
+        self.current_indices: List[int] = []  # [screen_id] -> current_index
+        self._iters: Dict[int, Iterator[str]] = {}  # {screen_id: itérateur de playlist}
+        self._playlist_sets: Dict[int, set] = {}  # {screen_id: chemins encore valides}
+        self._playlist_meta: Dict[int, List[tuple]] = {}  # {screen_id: [(path, filename, theme)]}
+        self._order: Dict[int, List[int]] = {}  # {screen_id: permutation d'indices}
+        self._active_screens: set = set()  # union des écrans playlist + thème
+        self.current_wallpapers: Dict[int, str] = {}  # {screen_id: current_filename}
+        self.current_themes: Dict[int, str] = {}  # {screen_id: current_theme_name}
+        # Ensembles maîtres mis à jour incrémentalement à chaque rotation
+        self._displayed_filenames_set: set = set()
+        self._displayed_themes_set: set = set()
+        self.random_mode = True
+        self._rng = random.Random()  # générateur dédié, sans l'état global partagé
+        self.callback: Optional[Callable] = None
+        self.smart_cache = smart_cache_manager
+        self._stop_event = threading.Event()
+        self._pause_event = threading.Event()  # armé = rotation active
+        self._pause_event.set()
+        self._task: Optional["asyncio.Task"] = None
+        self._async_stop_event: Optional["asyncio.Event"] = None
+        self._async_pause_event: Optional["asyncio.Event"] = None
+        self._exists_cache: Dict[str, tuple] = {}  # {path: (timestamp, exists)}
+        # Préchargement en tâche de fond de la prochaine image à télécharger
+        self._prefetch_pool = concurrent.futures.ThreadPoolExecutor(
+            max_workers=2, thread_name_prefix="rotation-prefetch"
+        )
+        self._prefetch_inflight: set = set()  # filenames en cours de téléchargement
+
+    def _path_exists(self, path: str) -> bool:
+        """
+        Vérifie l'existence d'un fichier avec mémoïsation (TTL 60s).
+
+        Une image de playlist est re-testée à chaque passage du cycle et
+        une image manquante l'est à chaque tick: le cache évite de refaire
+        un stat() par écran par tick sur des chemins déjà connus.
+
+        Args:
+            path: Chemin du fichier à vérifier
+
+        Returns:
+            True si le fichier existe
+        """
+        now = time.monotonic()
+        cached = self._exists_cache.get(path)
+        if cached is not None and now - cached[0] < 60:
+            return cached[1]
+
+        exists = os.path.isfile(path)
+        if len(self._exists_cache) > 4096:
+            self._exists_cache.pop(next(iter(self._exists_cache)))
+        self._exists_cache[path] = (now, exists)
+        return exists
+
+    def _ensure_screen(self, screen_id: int) -> None:
+        """
+        Étend les listes indexées par écran jusqu'à screen_id inclus.
+
+        Args:
+            screen_id: ID de l'écran
+        """
+        while len(self.playlists) <= screen_id:
+            self.playlists.append(None)
+        while len(self.current_indices) <= screen_id:
+            self.current_indices.append(0)
+
+    def _get_playlist(self, screen_id: int) -> Optional[List[str]]:
+        """
+        Accès borné à la playlist d'un écran.
+
+        Args:
+            screen_id: ID de l'écran
+
+        Returns:
+            Liste de chemins ou None si aucune playlist
+        """
+        if 0 <= screen_id < len(self.playlists):
+            return self.playlists[screen_id]
+        return None
+
+    def set_playlist(self, screen_id: int, image_paths: List[str]) -> None:
+        """
+        Définit la playlist pour un écran (méthode legacy pour compatibilité).
+        
+        Args:
+            screen_id: ID de l'écran
+            image_paths: Liste des chemins d'images
+        """
+        # La liste de chemins reste figée; seul un tableau d'indices est
+        # mélangé (Fisher-Yates sur des entiers, pas sur des références str)
+        self._ensure_screen(screen_id)
+        self.playlists[screen_id] = list(image_paths)
+        order = list(range(len(image_paths)))
+        if self.random_mode and order:
+            self._rng.shuffle(order)
+        self._order[screen_id] = order
+        self.current_indices[screen_id] = 0
+        self._playlist_sets[screen_id] = set(image_paths)
+        # Métadonnées (path, filename, theme) précalculées pour filtrer les
+        # candidats en une seule passe dans get_next_image
+        self._playlist_meta[screen_id] = [
+            (path,) + _extract_image_meta(path) for path in self.playlists[screen_id]
+        ]
+        self._iters[screen_id] = self._make_iter(screen_id)
+        self._active_screens.add(screen_id)
+
+    def _make_iter(self, screen_id: int) -> Iterator[str]:
+        """
+        Construit l'itérateur de playlist d'un écran.
+
+        Le générateur boucle sur la playlist, remélange en fin de passage
+        en mode aléatoire, et tient current_indices à jour pour
+        get_playlist_info. Un simple next() remplace ainsi les lectures/
+        écritures de dict et le test de débordement à chaque rotation.
+
+        Args:
+            screen_id: ID de l'écran
+
+        Yields:
+            Chemins d'images, en boucle infinie tant que la playlist existe
+        """
+        while True:
+            playlist = self._get_playlist(screen_id)
+            if not playlist:
+                return
+            valid_paths = self._playlist_sets.get(screen_id)
+            if valid_paths is None:
+                valid_paths = self._playlist_sets[screen_id] = set(playlist)
+            if not valid_paths:
+                return
+            order = self._order.get(screen_id)
+            if order is None or len(order) != len(playlist):
+                order = self._order[screen_id] = list(range(len(playlist)))
+            for position, index in enumerate(order):
+                image_path = playlist[index]
+                # Les chemins élagués (fichier disparu) sont ignorés sans
+                # list.remove: le discard du set suffit (O(1))
+                if image_path not in valid_paths:
+                    continue
+                self.current_indices[screen_id] = position + 1
+                yield image_path
+            self.current_indices[screen_id] = 0
+            if self.random_mode:
+                self._rng.shuffle(order)
+    
+    def clear_playlist(self, screen_id: int) -> None:
+        """
+        Retire un écran de la rotation.
+
+        Args:
+            screen_id: ID de l'écran
+        """
+        if 0 <= screen_id < len(self.playlists):
+            self.playlists[screen_id] = None
+        self._iters.pop(screen_id, None)
+        self._playlist_sets.pop(screen_id, None)
+        self._playlist_meta.pop(screen_id, None)
+        self._order.pop(screen_id, None)
+        self.theme_configs.pop(screen_id, None)
+        self._active_screens.discard(screen_id)
+
+    def set_theme_config(self, screen_id: int, theme_name: str, images_metadata: List[Dict]) -> None:
+        """
+        Définit la configuration du thème pour un écran (avec téléchargement progressif).
+        
+        Args:
+            screen_id: ID de l'écran
+            theme_name: Nom du thème
+            images_metadata: Liste des métadonnées d'images (avec 'url', 'filename', etc.)
+        """
+        self.theme_configs[screen_id] = {
+            'theme': theme_name,
+            'images': images_metadata.copy()
+        }
+        self._ensure_screen(screen_id)
+        self.current_indices[screen_id] = 0
+        self._active_screens.add(screen_id)
+        logger.info(f"Configuration du thème '{theme_name}' pour écran {screen_id}: {len(images_metadata)} images disponibles")
+    
+    def set_random_mode(self, enabled: bool) -> None:
+        """
+        Active ou désactive le mode aléatoire.
+        
+        Args:
+            enabled: True pour activer le mode aléatoire
+        """
+        self.random_mode = enabled
+        
+        # Réorganiser les ordres de parcours existants (les listes de
+        # chemins elles-mêmes ne bougent pas)
+        if enabled:
+            for screen_id, order in self._order.items():
+                self._rng.shuffle(order)
+                self.current_indices[screen_id] = 0
+    
+    def set_delay(self, seconds: int) -> None:
+        """
+        Définit le délai de rotation.
+        
+        Args:
+            seconds: Délai en secondes
+        """
+        self.delay_seconds = seconds
+        logger.info(f"Délai de rotation défini à {seconds} secondes")
+    
+    def set_callback(self, callback: Callable[[int, str], None]) -> None:
+        """
+        Définit la fonction de callback appelée lors de chaque rotation.
+        
+        Args:
+            callback: Fonction callback(screen_id, image_path)
+        """
+        self.callback = callback
+    
+    def _get_displayed_sets(self, screen_id: int) -> tuple:
+        """
+        Récupère les images et thèmes affichés sur les autres écrans.
+
+        Les ensembles maîtres sont entretenus incrémentalement par
+        _perform_rotation (retrait de l'ancienne valeur, ajout de la
+        nouvelle), au lieu d'être rebâtis à chaque décision de rotation.
+
+        Args:
+            screen_id: ID de l'écran à exclure
+
+        Returns:
+            Tuple (filenames affichés ailleurs, thèmes affichés ailleurs)
+        """
+        # Instantané local des dicts copy-on-write: cohérent sans verrou
+        # même si la rotation les remplace pendant la lecture
+        wallpapers = self.current_wallpapers
+        themes = self.current_themes
+
+        own_filename = wallpapers.get(screen_id)
+        own_theme = themes.get(screen_id)
+        filenames = self._displayed_filenames_set - {own_filename}
+        themes = self._displayed_themes_set - {own_theme}
+        return filenames, themes
+
+    def _extract_theme_from_path(self, image_path: str) -> str:
+        """
+        Extrait le nom du thème depuis le chemin de l'image.
+        
+        Args:
+            image_path: Chemin de l'image (ex: data/wallpapers/Earth/image.jpg)
+            
+        Returns:
+            Nom du thème ou "Unknown"
+        """
+        return _extract_image_meta(image_path)[1]
+    
+    def get_next_image(self, screen_id: int) -> Optional[NextImage]:
+        """
+        Récupère la prochaine image pour un écran (évite les doublons entre écrans).
+        
+        Args:
+            screen_id: ID de l'écran
+            
+        Returns:
+            NextImage (path, filename, theme) ou None
+        """
+        playlist = self._get_playlist(screen_id)
+        if not playlist:
+            return None
+
+        # L'itérateur gère le bouclage et le remélange en interne
+        playlist_iter = self._iters.get(screen_id)
+        if playlist_iter is None:
+            playlist_iter = self._iters[screen_id] = self._make_iter(screen_id)
+
+        # Récupérer les images et thèmes actuellement affichés sur les autres écrans
+        currently_displayed_filenames, currently_displayed_themes = \
+            self._get_displayed_sets(screen_id)
+
+        if currently_displayed_themes:
+            logger.info("📋 Thèmes actuellement affichés sur d'autres écrans: %s", currently_displayed_themes)
+        
+        # Cas courant: le prochain candidat de l'itérateur convient directement
+        image_path = next(playlist_iter, None)
+        if image_path is None:
+            return None
+        filename, theme_name = _extract_image_meta(image_path)
+
+        if (filename not in currently_displayed_filenames
+                and theme_name not in currently_displayed_themes):
+            logger.info("✓ Thème '%s' sélectionné pour écran %s (différent des autres écrans)", theme_name, screen_id)
+            return NextImage(image_path, filename, theme_name)
+
+        # Sinon, une seule passe de filtrage sur les métadonnées précalculées
+        # au lieu de sonder la playlist candidat par candidat
+        valid_paths = self._playlist_sets.get(screen_id, ())
+        candidates = [
+            meta for meta in self._playlist_meta.get(screen_id, ())
+            if meta[1] not in currently_displayed_filenames
+            and meta[2] not in currently_displayed_themes
+            and meta[0] in valid_paths
+        ]
+
+        if candidates:
+            if self.random_mode:
+                image_path, filename, theme_name = self._rng.choice(candidates)
+            else:
+                image_path, filename, theme_name = candidates[0]
+            logger.info("✓ Thème '%s' sélectionné pour écran %s (différent des autres écrans)", theme_name, screen_id)
+            return NextImage(image_path, filename, theme_name)
+
+        # Si aucune image ne satisfait les critères, prendre n'importe laquelle
+        logger.warning("⚠️ Impossible de trouver une image sans doublon de thème, autorisation d'un doublon temporaire")
+        return NextImage(image_path, filename, theme_name)
+    
+    def start(self) -> None:
+        """Démarre la rotation automatique."""
+        if self.is_running:
+            logger.warning("La rotation est déjà en cours")
+            return
+        
+        self.is_running = True
+        self.is_paused = False
+        self._stop_event.clear()
+        self._pause_event.set()
+
+        # Si une boucle asyncio tourne déjà, planifier la rotation comme
+        # tâche coroutine (pas de thread OS dédié, annulation immédiate).
+        # Sinon, repli sur le thread classique (cas de l'interface Tk).
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is not None:
+            self._async_stop_event = asyncio.Event()
+            self._async_pause_event = asyncio.Event()
+            self._async_pause_event.set()
+            self._task = loop.create_task(self._rotation_loop_async())
+        else:
+            self.thread = threading.Thread(target=self._rotation_loop, daemon=True)
+            self.thread.start()
+
+        logger.info(f"Rotation démarrée (délai: {self.delay_seconds}s)")
+
+    def stop(self) -> None:
+        """Arrête la rotation automatique."""
+        if not self.is_running:
+            return
+
+        self.is_running = False
+        self._stop_event.set()
+        # Réveiller le thread s'il est bloqué sur la porte de pause
+        self._pause_event.set()
+
+        if self._task:
+            if self._async_stop_event:
+                self._async_stop_event.set()
+            if self._async_pause_event:
+                self._async_pause_event.set()
+            self._task.cancel()
+            self._task = None
+
+        if self.thread:
+            self.thread.join(timeout=2)
+
+        logger.info("Rotation arrêtée")
+    
+    def pause(self) -> None:
+        """Met en pause la rotation."""
+        if not self.is_running:
+            return
+        
+        self.is_paused = True
+        self._pause_event.clear()
+        if self._async_pause_event:
+            self._async_pause_event.clear()
+        logger.info("Rotation mise en pause")
+    
+    def resume(self) -> None:
+        """Reprend la rotation."""
+        if not self.is_running or not self.is_paused:
+            return
+        
+        self.is_paused = False
+        self._pause_event.set()
+        if self._async_pause_event:
+            self._async_pause_event.set()
+        logger.info("Rotation reprise")
+    
+    def toggle_pause(self) -> bool:
+        """
+        Bascule entre pause et lecture.
+        
+        Returns:
+            True si en pause après le toggle
+        """
+        if self.is_paused:
+            self.resume()
+        else:
+            self.pause()
+        return self.is_paused
+    
+    def rotate_now(self) -> None:
+        """Force une rotation immédiate."""
+        logger.info("Rotation forcée")
+        self._perform_rotation()
+    
+    def _rotation_loop(self) -> None:
+        """Boucle principale de rotation (exécutée dans un thread)."""
+        # Échéance monotone: la durée de la rotation elle-même (copies,
+        # écritures registre) ne décale plus la cadence au fil des heures
+        pause_wait = self._pause_event.wait
+        stop_wait = self._stop_event.wait
+        deadline = time.monotonic() + self.delay_seconds
+        while self.is_running:
+            # Si en pause, bloquer sur l'événement: aucun réveil périodique
+            # tant que resume() (ou stop()) n'est pas appelé
+            if not self._pause_event.is_set():
+                pause_wait()
+                if self._stop_event.is_set():
+                    break
+                deadline = time.monotonic() + self.delay_seconds
+
+            # Attendre jusqu'à l'échéance (avec possibilité d'interruption)
+            remaining = deadline - time.monotonic()
+            logger.debug("Attente de %.1fs avant prochaine rotation", max(0.0, remaining))
+            if remaining > 0 and stop_wait(timeout=remaining):
+                break
+
+            # Effectuer la rotation
+            logger.debug("Déclenchement rotation automatique")
+            self._perform_rotation()
+
+            deadline += self.delay_seconds
+            # Si la rotation a dépassé une période entière, se re-caler
+            # plutôt que d'enchaîner des ticks de rattrapage
+            now = time.monotonic()
+            if deadline < now:
+                deadline = now + self.delay_seconds
+
+    async def _rotation_loop_async(self) -> None:
+        """Boucle de rotation en tâche asyncio (variante sans thread dédié)."""
+        try:
+            while self.is_running:
+                # Si en pause, bloquer sur l'événement sans réveil périodique
+                if not self._async_pause_event.is_set():
+                    await self._async_pause_event.wait()
+                    if self._async_stop_event.is_set():
+                        break
+
+                # Attendre le délai (avec possibilité d'interruption)
+                logger.debug("Attente de %ss avant prochaine rotation", self.delay_seconds)
+                try:
+                    await asyncio.wait_for(
+                        self._async_stop_event.wait(),
+                        timeout=self.delay_seconds
+                    )
+                    break
+                except asyncio.TimeoutError:
+                    pass
+
+                # Effectuer la rotation
+                logger.debug("Déclenchement rotation automatique")
+                self._perform_rotation()
+        except asyncio.CancelledError:
+            pass
+
+    def _perform_rotation(self) -> None:
+        """Effectue une rotation pour tous les écrans actifs."""
+        if not self.callback:
+            logger.warning("Aucun callback défini pour la rotation")
+            return
+        
+        if not self.playlists and not self.theme_configs:
+            logger.warning("Aucune configuration définie pour la rotation")
+            return
+        
+        # Instantané des deux systèmes: évite de re-consulter les dicts
+        # d'instance à chaque écran dans la boucle
+        theme_configs = self.theme_configs
+        smart_cache = self.smart_cache
+        # Union maintenue par set_playlist/set_theme_config: rien à rebâtir.
+        # Instantané (tuple) car le thread Tk peut ajouter un écran pendant
+        # l'itération
+        screens_to_rotate = tuple(self._active_screens)
+
+        logger.debug("Rotation en cours pour %s écran(s)", len(screens_to_rotate))
+
+        for screen_id in screens_to_rotate:
+            try:
+                next_image = None
+
+                # Essayer d'abord le nouveau système avec téléchargement progressif
+                if screen_id in theme_configs and smart_cache:
+                    next_image = self._get_next_image_with_download(screen_id)
+
+                # Fallback sur l'ancien système si le nouveau échoue ou n'est pas configuré
+                if not next_image and self._get_playlist(screen_id):
+                    next_image = self.get_next_image(screen_id)
+                
+                if next_image:
+                    # filename et thème déjà calculés par le getter: aucun
+                    # redécoupage de chemin ici
+                    next_image_path, filename, theme_from_path = next_image
+
+                    # Vérifier que le fichier existe (résultat mémoïsé 60s pour
+                    # éviter un stat() par écran à chaque tick)
+                    if self._path_exists(next_image_path):
+                        logger.debug("Application image écran %s: %s (thème: %s)", screen_id, filename, theme_from_path)
+                        self.callback(screen_id, next_image_path)
+                        
+                        # Enregistrer l'image et le thème actuellement affichés
+                        # sur cet écran. Copy-on-write: on échange des dicts
+                        # neufs (swap de référence atomique en CPython), aucun
+                        # lecteur ne peut observer une mutation en cours
+                        old_filename = self.current_wallpapers.get(screen_id)
+                        old_theme = self.current_themes.get(screen_id)
+                        new_wallpapers = dict(self.current_wallpapers)
+                        new_wallpapers[screen_id] = filename
+                        new_themes = dict(self.current_themes)
+                        new_themes[screen_id] = theme_from_path
+                        self.current_wallpapers = new_wallpapers
+                        self.current_themes = new_themes
+
+                        # Mise à jour incrémentale des ensembles maîtres:
+                        # O(1) par rotation au lieu d'une reconstruction O(S)
+                        if old_filename is not None:
+                            self._displayed_filenames_set.discard(old_filename)
+                        self._displayed_filenames_set.add(filename)
+                        if old_theme is not None:
+                            self._displayed_themes_set.discard(old_theme)
+                        self._displayed_themes_set.add(theme_from_path)
+                        
+                        # Marquer l'image comme affichée dans le cache intelligent
+                        if smart_cache and screen_id in theme_configs:
+                            theme_name = theme_configs[screen_id]['theme']
+                            smart_cache.mark_as_displayed(theme_name, next_image_path)
+                            logger.debug("Image marquée comme affichée: %s", filename)
+                            # Précharger la prochaine image pendant le délai de
+                            # rotation: le tick suivant la trouvera en cache
+                            self._prefetch_pool.submit(self._prefetch_next, screen_id)
+                    else:
+                        logger.warning("Image introuvable: %s", next_image_path)
+                        # Élaguer le chemin en O(1): l'itérateur de playlist
+                        # l'ignorera aux prochains passages
+                        valid_paths = self._playlist_sets.get(screen_id)
+                        if valid_paths is not None:
+                            valid_paths.discard(next_image_path)
+                else:
+                    logger.warning("Aucune image disponible pour l'écran %s", screen_id)
+                
+            except Exception as e:
+                # Pas de exc_info ici: le formatage de traceback est coûteux
+                # et une rafale d'erreurs (NAS injoignable) bloquerait le tick
+                logger.warning("Erreur lors de la rotation pour l'écran %s: %s", screen_id, e)
+    
+    def _get_next_image_with_download(self, screen_id: int) -> Optional[NextImage]:
+        """
+        Récupère la prochaine image avec téléchargement automatique si nécessaire.
+
+        Suppose self.smart_cache défini: l'appelant (_perform_rotation) ne
+        prend cette voie que lorsque le cache intelligent est disponible,
+        ce qui évite de re-tester smart_cache à chaque étape ici.
+
+        Args:
+            screen_id: ID de l'écran
+            
+        Returns:
+            Chemin local de l'image, ou None si échec
+        """
+        if screen_id not in self.theme_configs:
+            return None
+        
+        theme_config = self.theme_configs[screen_id]
+        theme_name = theme_config['theme']
+        images_metadata = theme_config['images']
+        
+        if not images_metadata:
+            logger.warning("Aucune image disponible pour le thème '%s'", theme_name)
+            return None
+        
+        # Récupérer les images et thèmes actuellement affichés sur les autres écrans
+        currently_displayed_on_other_screens, currently_displayed_themes_on_other_screens = \
+            self._get_displayed_sets(screen_id)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Images actuellement affichées sur d'autres écrans: {currently_displayed_on_other_screens}")
+            logger.debug(f"Thèmes actuellement affichés sur d'autres écrans: {currently_displayed_themes_on_other_screens}")
+        
+        # L'ensemble des images déjà affichées est calculé une seule fois:
+        # les tests deviennent des appartenances O(1) au lieu d'un parcours
+        # linéaire de l'index par image via is_image_displayed
+        displayed_set = self.smart_cache.get_displayed_set(theme_name)
+
+        # Filtrer les images déjà affichées pour ce cycle ET celles affichées sur d'autres écrans
+        undisplayed_images = [
+            img for img in images_metadata
+            if img.get('filename')
+            and img['filename'] not in currently_displayed_on_other_screens
+            and img['filename'] not in displayed_set
+        ]
+
+        logger.debug("Images non affichées pour '%s': %s/%s",
+                     theme_name, len(undisplayed_images), len(images_metadata))
+
+        # Si toutes les images non affichées sont sur d'autres écrans, autoriser les doublons
+        if not undisplayed_images:
+            # Vérifier si c'est parce que le cycle est terminé ou juste des doublons
+            cycle_remaining = [img for img in images_metadata
+                               if img.get('filename', '') not in displayed_set]
+
+            if not cycle_remaining:
+                # Cycle vraiment terminé
+                logger.info("🔄 Cycle terminé pour '%s' ! Réinitialisation...", theme_name)
+                self.smart_cache.reset_cycle(theme_name)
+                # Toutes les images sont maintenant disponibles à nouveau
+                undisplayed_images = [img for img in images_metadata
+                                     if img.get('filename') not in currently_displayed_on_other_screens]
+                logger.info("Nouveau cycle commencé, %s images disponibles", len(undisplayed_images))
+            else:
+                # Des images sont dispo mais affichées sur d'autres écrans
+                # Dans ce cas, on autorise un doublon temporaire
+                logger.warning("Toutes les images non affichées sont sur d'autres écrans, sélection parmi toutes")
+                undisplayed_images = cycle_remaining
+        
+        # Sélectionner l'image suivante parmi les images non affichées
+        if self.random_mode:
+            # Mode aléatoire
+            image_metadata = self._rng.choice(undisplayed_images)
+        else:
+            # Mode séquentiel
+            current_index = self.current_indices[screen_id]
+            image_metadata = undisplayed_images[current_index % len(undisplayed_images)]
+            self.current_indices[screen_id] = (current_index + 1) % len(undisplayed_images)
+        
+        filename = image_metadata.get('filename', '')
+        url = image_metadata.get('url', '')
+        
+        if not filename or not url:
+            logger.error("Métadonnées invalides pour l'image: %s", image_metadata)
+            return None
+        
+        logger.debug("Image sélectionnée pour écran %s: %s", screen_id, filename)
+        
+        # Vérifier si l'image est déjà téléchargée localement
+        local_path = self.smart_cache.get_image_local_path(theme_name, filename)
+
+        if local_path and self._path_exists(local_path):
+            logger.debug("Image déjà en cache: %s", filename)
+            # Ne pas marquer ici, ce sera fait après l'application du fond d'écran
+            return NextImage(local_path, filename, theme_name)
+
+        # Image pas encore téléchargée, télécharger maintenant
+        logger.info("📥 Téléchargement de l'image %s pour le thème '%s'...", filename, theme_name)
+
+        try:
+            downloaded_path = self.smart_cache.download_single_image(
+                theme_name=theme_name,
+                image_url=url,
+                filename=filename
+            )
+
+            if downloaded_path:
+                # Fichier fraîchement écrit: purger l'éventuelle entrée
+                # négative du cache d'existence avant de re-tester
+                self._exists_cache.pop(downloaded_path, None)
+
+            if downloaded_path and self._path_exists(downloaded_path):
+                logger.info("✓ Image téléchargée avec succès: %s", filename)
+                # Ne pas marquer ici, ce sera fait après l'application du fond d'écran
+                return NextImage(downloaded_path, filename, theme_name)
+            else:
+                logger.error("Échec du téléchargement de %s", filename)
+                return None
+
+        except Exception as e:
+            logger.warning("Erreur lors du téléchargement de %s: %s", filename, e)
+            return None
+    
+    def _prefetch_next(self, screen_id: int) -> None:
+        """
+        Télécharge en avance une image candidate pour le prochain tick.
+
+        Exécuté hors du thread de rotation: la latence réseau est masquée
+        par le délai de rotation au lieu de bloquer rotate_now. Ne marque
+        rien comme affiché et n'avance aucun index (simple peek-ahead).
+
+        Args:
+            screen_id: ID de l'écran
+        """
+        try:
+            theme_config = self.theme_configs.get(screen_id)
+            if not theme_config or not self.smart_cache:
+                return
+
+            theme_name = theme_config['theme']
+            displayed_set = self.smart_cache.get_displayed_set(theme_name)
+
+            for img in theme_config['images']:
+                filename = img.get('filename', '')
+                url = img.get('url', '')
+                if not filename or not url or filename in displayed_set:
+                    continue
+                if filename in self._prefetch_inflight:
+                    return
+
+                local_path = self.smart_cache.get_image_local_path(theme_name, filename)
+                if local_path and os.path.isfile(local_path):
+                    # Déjà en cache: le prochain tick sera immédiat
+                    return
+
+                self._prefetch_inflight.add(filename)
+                try:
+                    logger.debug("Préchargement de %s pour le thème '%s'", filename, theme_name)
+                    downloaded_path = self.smart_cache.download_single_image(
+                        theme_name=theme_name,
+                        image_url=url,
+                        filename=filename
+                    )
+                    if downloaded_path:
+                        self._exists_cache.pop(downloaded_path, None)
+                finally:
+                    self._prefetch_inflight.discard(filename)
+                return
+
+        except Exception as e:
+            logger.debug("Préchargement impossible pour l'écran %s: %s", screen_id, e)
+
+    def get_playlist_info(self, screen_id: int) -> Dict:
+        """
+        Récupère les informations de la playlist d'un écran.
+        
+        Args:
+            screen_id: ID de l'écran
+            
+        Returns:
+            Dictionnaire avec les informations
+        """
+        playlist = self._get_playlist(screen_id) or []
+        current_index = (self.current_indices[screen_id]
+                         if screen_id < len(self.current_indices) else 0)
+        
+        return {
+            'total_images': len(playlist),
+            'current_index': current_index,
+            'remaining': len(playlist) - current_index if playlist else 0
+        }
+    
+    def is_active(self) -> bool:
+        """
+        Vérifie si la rotation est active.
+        
+        Returns:
+            True si active (démarrée et non en pause)
+        """
+        return self.is_running and not self.is_paused
+
+
@@ -1,6 +1,7 @@
 """Module de détection et gestion des écrans Windows."""
 
 import ctypes
+import time
 from typing import Dict, List, Tuple
 
 try:
@@ -21,15 +22,27 @@ class ScreenDetector:
     def __init__(self):
         """Initialise le détecteur d'écrans."""
         self.screens: List[Dict] = []
+        self._by_id: Dict[int, Dict] = {}
+        self._primary: Dict = {}
+        self._last_detect_ts = 0.0  # horodatage monotone de la dernière énumération
         self.detect_screens()
-    
+
     def detect_screens(self) -> List[Dict]:
         """
         Détecte tous les écrans connectés.
-        
+
+        Le résultat est mémoïsé pendant ~1 seconde: la topologie des écrans
+        ne change pas entre deux appels rapprochés, inutile de refaire
+        l'énumération Win32 à chaque consultation. Appeler invalidate()
+        pour forcer une nouvelle énumération (ex: écran branché/débranché).
+
         Returns:
             Liste des informations d'écrans
         """
+        now = time.monotonic()
+        if self.screens and now - self._last_detect_ts < 1.0:
+            return self.screens
+
         try:
             monitors = win32api.EnumDisplayMonitors()
             temp_screens = []
@@ -37,21 +50,25 @@ class ScreenDetector:
             # Récupérer tous les moniteurs avec leurs informations
             for i, monitor in enumerate(monitors):
                 monitor_info = win32api.GetMonitorInfo(monitor[0])
-                monitor_data = monitor_info['Monitor']
-                is_primary = monitor_info['Flags'] & win32con.MONITORINFOF_PRIMARY == win32con.MONITORINFOF_PRIMARY
+                # Géométrie dépaquetée une seule fois (au lieu de ré-indexer
+                # le tuple pour chaque champ dérivé)
+                left, top, right, bottom = monitor_info['Monitor']
+                width = right - left
+                height = bottom - top
+                is_primary = bool(monitor_info['Flags'] & win32con.MONITORINFOF_PRIMARY)
                 device_name = monitor_info.get('Device', f'DISPLAY{i+1}')
-                
+
                 screen_info = {
                     'enum_index': i,  # Index d'énumération original
                     'handle': monitor[0],
                     'device_name': device_name,
-                    'resolution': f"{monitor_data[2] - monitor_data[0]}x{monitor_data[3] - monitor_data[1]}",
-                    'width': monitor_data[2] - monitor_data[0],
-                    'height': monitor_data[3] - monitor_data[1],
-                    'left': monitor_data[0],
-                    'top': monitor_data[1],
-                    'right': monitor_data[2],
-                    'bottom': monitor_data[3],
+                    'resolution': f"{width}x{height}",
+                    'width': width,
+                    'height': height,
+                    'left': left,
+                    'top': top,
+                    'right': right,
+                    'bottom': bottom,
                     'is_primary': is_primary
                 }
                 
@@ -77,7 +94,17 @@ class ScreenDetector:
                 self.screens.append(screen)
                 
                 logger.debug(f"Écran {i}: {screen['device_name']} (enum_index={screen['enum_index']})")
-            
+
+            # Index id -> écran et écran principal précalculés: les accès
+            # répétés depuis la rotation deviennent des lectures O(1)
+            self._by_id = {screen['id']: screen for screen in self.screens}
+            self._primary = next(
+                (screen for screen in self.screens if screen['is_primary']),
+                self.screens[0] if self.screens else {}
+            )
+
+            self._last_detect_ts = now
+
             logger.info(f"{len(self.screens)} écran(s) détecté(s)")
             for screen in self.screens:
                 primary_marker = " ← ÉCRAN PRINCIPAL" if screen['is_primary'] else ""
@@ -116,12 +143,7 @@ class ScreenDetector:
         Returns:
             Informations de l'écran principal
         """
-        for screen in self.screens:
-            if screen['is_primary']:
-                return screen
-        
-        # Fallback sur le premier écran si aucun n'est marqué comme principal
-        return self.screens[0] if self.screens else {}
+        return self._primary
     
     def get_screen_by_id(self, screen_id: int) -> Dict:
         """
@@ -133,19 +155,21 @@ class ScreenDetector:
         Returns:
             Informations de l'écran ou dict vide si non trouvé
         """
-        for screen in self.screens:
-            if screen['id'] == screen_id:
-                return screen
-        return {}
+        return self._by_id.get(screen_id, {})
     
+    def invalidate(self) -> None:
+        """Invalide le cache de détection pour forcer une ré-énumération."""
+        self._last_detect_ts = 0.0
+
     def refresh(self) -> List[Dict]:
         """
         Rafraîchit la détection des écrans.
-        
+
         Returns:
             Liste mise à jour des écrans
         """
         logger.info("Rafraîchissement de la détection des écrans")
+        self.invalidate()
         return self.detect_screens()
 
 
@@ -1,435 +1,884 @@
-"""Module de gestion des fonds d'écran Windows."""
-
-import ctypes
-import os
-from pathlib import Path
-from typing import Dict, Optional
-
-try:
-    import win32api
-    import win32con
-    import win32gui
-except ImportError:
-    print("pywin32 n'est pas installé. Exécutez: pip install pywin32")
-    raise
-
-from PIL import Image
-
-from ..utils.logger import get_logger
-
-logger = get_logger()
-
-# Définition de l'interface IDesktopWallpaper pour comtypes
-try:
-    import comtypes
-    from comtypes import GUID, COMMETHOD, HRESULT
-    from ctypes import POINTER, c_uint, c_wchar_p
-    from ctypes.wintypes import DWORD, RECT
-    
-    class IDesktopWallpaper(comtypes.IUnknown):
-        _iid_ = GUID("{B92B56A9-8B55-4E14-9A89-0199BBB6F93B}")
-        _methods_ = [
-            COMMETHOD([], HRESULT, 'SetWallpaper',
-                      (['in'], c_wchar_p, 'monitorID'),
-                      (['in'], c_wchar_p, 'wallpaper')),
-            COMMETHOD([], HRESULT, 'GetWallpaper',
-                      (['in'], c_wchar_p, 'monitorID'),
-                      (['out'], POINTER(c_wchar_p), 'wallpaper')),
-            COMMETHOD([], HRESULT, 'GetMonitorDevicePathAt',
-                      (['in'], c_uint, 'monitorIndex'),
-                      (['out'], POINTER(c_wchar_p), 'monitorID')),
-            COMMETHOD([], HRESULT, 'GetMonitorDevicePathCount',
-                      (['out'], POINTER(c_uint), 'count')),
-            COMMETHOD([], HRESULT, 'GetMonitorRECT',
-                      (['in'], c_wchar_p, 'monitorID'),
-                      (['out'], POINTER(RECT), 'displayRect')),
-            COMMETHOD([], HRESULT, 'SetBackgroundColor',
-                      (['in'], DWORD, 'color')),
-            COMMETHOD([], HRESULT, 'GetBackgroundColor',
-                      (['out'], POINTER(DWORD), 'color')),
-            COMMETHOD([], HRESULT, 'SetPosition',
-                      (['in'], c_uint, 'position')),
-            COMMETHOD([], HRESULT, 'GetPosition',
-                      (['out'], POINTER(c_uint), 'position')),
-            COMMETHOD([], HRESULT, 'SetSlideshow',
-                      (['in'], c_wchar_p, 'items')),
-            COMMETHOD([], HRESULT, 'GetSlideshow',
-                      (['out'], POINTER(c_wchar_p), 'items')),
-            COMMETHOD([], HRESULT, 'SetSlideshowOptions',
-                      (['in'], c_uint, 'options'),
-                      (['in'], c_uint, 'slideshowTick')),
-            COMMETHOD([], HRESULT, 'GetSlideshowOptions',
-                      (['out'], POINTER(c_uint), 'options'),
-                      (['out'], POINTER(c_uint), 'slideshowTick')),
-            COMMETHOD([], HRESULT, 'AdvanceSlideshow',
-                      (['in'], c_wchar_p, 'monitorID'),
-                      (['in'], c_uint, 'direction')),
-            COMMETHOD([], HRESULT, 'GetStatus',
-                      (['out'], POINTER(c_uint), 'state')),
-            COMMETHOD([], HRESULT, 'Enable',
-                      (['in'], c_uint, 'enable')),
-        ]
-    
-    COMTYPES_AVAILABLE = True
-except ImportError:
-    COMTYPES_AVAILABLE = False
-    logger.debug("comtypes non disponible")
-
-
-class WallpaperManager:
-    """Gestionnaire de fonds d'écran Windows."""
-    
-    # Styles d'affichage Windows
-    STYLE_FILL = 10  # Remplir
-    STYLE_FIT = 6    # Ajuster
-    STYLE_STRETCH = 2  # Étirer
-    STYLE_CENTER = 0   # Centrer
-    STYLE_TILE = 1     # Mosaïque
-    STYLE_SPAN = 22    # Étendre (multi-moniteurs)
-    
-    STYLE_MAP = {
-        'fill': STYLE_FILL,
-        'fit': STYLE_FIT,
-        'stretch': STYLE_STRETCH,
-        'center': STYLE_CENTER,
-        'tile': STYLE_TILE,
-        'span': STYLE_SPAN
-    }
-    
-    def __init__(self):
-        """Initialise le gestionnaire de fonds d'écran."""
-        self.SPI_SETDESKWALLPAPER = 20
-        self.SPIF_UPDATEINIFILE = 0x01
-        self.SPIF_SENDCHANGE = 0x02
-        
-        # Essayer d'initialiser l'API moderne IDesktopWallpaper (Windows 10+)
-        self.desktop_wallpaper = None
-        if COMTYPES_AVAILABLE:
-            try:
-                import comtypes.client
-                # CLSID de DesktopWallpaper
-                desktop_wallpaper_clsid = GUID("{C2CF3110-460E-4fc1-B9D0-8A1C0C9CC4BD}")
-                self.desktop_wallpaper = comtypes.client.CreateObject(
-                    desktop_wallpaper_clsid,
-                    interface=IDesktopWallpaper
-                )
-                logger.info("✓ API moderne IDesktopWallpaper disponible (multi-moniteurs natif)")
-            except Exception as e:
-                logger.warning(f"API IDesktopWallpaper non disponible, utilisation du mode composite: {e}")
-        else:
-            logger.info("comtypes non installé, utilisation du mode composite")
-    
-    def set_wallpaper(
-        self,
-        image_path: str,
-        screen_id: Optional[int] = None,
-        fit_mode: str = 'fill',
-        is_composite: bool = False
-    ) -> bool:
-        """
-        Définit le fond d'écran.
-        
-        Args:
-            image_path: Chemin de l'image
-            screen_id: ID de l'écran (si None, applique à tous les écrans)
-            fit_mode: Mode d'ajustement ('fill', 'fit', 'stretch', 'center', 'tile', 'span')
-            is_composite: True si c'est une image composite multi-moniteurs
-            
-        Returns:
-            True si succès, False sinon
-        """
-        try:
-            # Vérifier que le fichier existe
-            image_path = os.path.abspath(image_path)
-            if not os.path.exists(image_path):
-                logger.error(f"Le fichier n'existe pas: {image_path}")
-                return False
-            
-            # Si API moderne disponible ET screen_id spécifié, utiliser IDesktopWallpaper
-            if self.desktop_wallpaper is not None and screen_id is not None:
-                return self._set_wallpaper_per_monitor(image_path, screen_id)
-            
-            # Sinon, utiliser l'API classique (tous les écrans)
-            # Pour un composite multi-moniteurs, forcer le mode "span"
-            if is_composite:
-                style_value = self.STYLE_SPAN
-                logger.info("Mode SPAN activé pour composite multi-moniteurs")
-            else:
-                style_value = self.STYLE_MAP.get(fit_mode, self.STYLE_FILL)
-            
-            self._set_wallpaper_style(style_value)
-            
-            # Appliquer le fond d'écran
-            result = ctypes.windll.user32.SystemParametersInfoW(
-                self.SPI_SETDESKWALLPAPER,
-                0,
-                image_path,
-                self.SPIF_UPDATEINIFILE | self.SPIF_SENDCHANGE
-            )
-            
-            if result:
-                mode_name = "span" if is_composite else fit_mode
-                logger.info(f"Fond d'écran appliqué: {os.path.basename(image_path)} (mode: {mode_name})")
-                return True
-            else:
-                logger.error(f"Échec de l'application du fond d'écran: {image_path}")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Erreur lors de l'application du fond d'écran: {e}", exc_info=True)
-            return False
-    
-    def _set_wallpaper_per_monitor(self, image_path: str, screen_id: int) -> bool:
-        """
-        Définit le fond d'écran pour un moniteur spécifique (Windows 10+).
-        
-        Args:
-            image_path: Chemin de l'image
-            screen_id: ID de l'écran
-            
-        Returns:
-            True si succès
-        """
-        try:
-            # Initialiser COM pour ce thread si nécessaire
-            import pythoncom
-            try:
-                pythoncom.CoInitialize()
-                logger.debug("COM initialisé pour ce thread")
-            except Exception:
-                # Déjà initialisé, pas grave
-                pass
-            
-            # Créer une nouvelle instance COM pour ce thread
-            # (les objets COM ne peuvent pas être partagés entre threads)
-            import comtypes.client
-            desktop_wallpaper = comtypes.client.CreateObject(
-                GUID("{C2CF3110-460E-4fc1-B9D0-8A1C0C9CC4BD}"),
-                interface=IDesktopWallpaper
-            )
-            
-            # Récupérer les informations de l'écran pour les logs
-            from .screen_detector import ScreenDetector
-            detector = ScreenDetector()
-            screens = detector.get_screens()
-            
-            # Trouver l'écran correspondant
-            screen_info = None
-            for screen in screens:
-                if screen['id'] == screen_id:
-                    screen_info = screen
-                    break
-            
-            if screen_info is None:
-                logger.error(f"Écran avec ID {screen_id} introuvable")
-                return False
-            
-            device_name = screen_info.get('device_name', 'Unknown')
-            
-            # Récupérer le nombre de moniteurs via l'interface COM
-            monitor_count = desktop_wallpaper.GetMonitorDevicePathCount()
-            logger.debug(f"Nombre de moniteurs détectés par COM: {monitor_count}")
-            
-            if screen_id >= monitor_count:
-                logger.error(f"Screen ID {screen_id} invalide (max: {monitor_count-1})")
-                return False
-            
-            # IMPORTANT : GetMonitorDevicePathAt() retourne les moniteurs dans l'ordre
-            # DISPLAY1, DISPLAY2, DISPLAY3... (ordre alphabétique/trié)
-            # qui correspond à notre screen_id après tri par device_name !
-            # Donc on utilise directement screen_id, pas windows_index
-            monitor_id = desktop_wallpaper.GetMonitorDevicePathAt(screen_id)
-            logger.debug(f"Device path pour screen_id {screen_id}: {monitor_id}")
-            
-            # Définir le fond d'écran pour ce moniteur
-            desktop_wallpaper.SetWallpaper(monitor_id, image_path)
-            
-            logger.info(f"✓ Fond d'écran appliqué sur écran {screen_id} ({device_name}): {os.path.basename(image_path)}")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Erreur IDesktopWallpaper: {e}", exc_info=True)
-            return False
-    
-    def _set_wallpaper_style(self, style: int) -> None:
-        """
-        Définit le style d'affichage du fond d'écran dans le registre Windows.
-        
-        Args:
-            style: Valeur du style
-        """
-        try:
-            import winreg
-            
-            key = winreg.OpenKey(
-                winreg.HKEY_CURRENT_USER,
-                r"Control Panel\Desktop",
-                0,
-                winreg.KEY_SET_VALUE
-            )
-            
-            if style == self.STYLE_TILE:
-                winreg.SetValueEx(key, "WallpaperStyle", 0, winreg.REG_SZ, "0")
-                winreg.SetValueEx(key, "TileWallpaper", 0, winreg.REG_SZ, "1")
-            elif style == self.STYLE_CENTER:
-                winreg.SetValueEx(key, "WallpaperStyle", 0, winreg.REG_SZ, "0")
-                winreg.SetValueEx(key, "TileWallpaper", 0, winreg.REG_SZ, "0")
-            elif style == self.STYLE_STRETCH:
-                winreg.SetValueEx(key, "WallpaperStyle", 0, winreg.REG_SZ, "2")
-                winreg.SetValueEx(key, "TileWallpaper", 0, winreg.REG_SZ, "0")
-            elif style == self.STYLE_FIT:
-                winreg.SetValueEx(key, "WallpaperStyle", 0, winreg.REG_SZ, "6")
-                winreg.SetValueEx(key, "TileWallpaper", 0, winreg.REG_SZ, "0")
-            elif style == self.STYLE_FILL:
-                winreg.SetValueEx(key, "WallpaperStyle", 0, winreg.REG_SZ, "10")
-                winreg.SetValueEx(key, "TileWallpaper", 0, winreg.REG_SZ, "0")
-            elif style == self.STYLE_SPAN:
-                # Mode SPAN (22) : étend l'image sur tous les moniteurs
-                winreg.SetValueEx(key, "WallpaperStyle", 0, winreg.REG_SZ, "22")
-                winreg.SetValueEx(key, "TileWallpaper", 0, winreg.REG_SZ, "0")
-            
-            winreg.CloseKey(key)
-            
-            logger.debug(f"Style de fond d'écran défini : {style}")
-            
-        except Exception as e:
-            logger.warning(f"Impossible de définir le style dans le registre: {e}")
-    
-    def get_current_wallpaper(self) -> Optional[str]:
-        """
-        Récupère le chemin du fond d'écran actuel.
-        
-        Returns:
-            Chemin du fond d'écran ou None
-        """
-        try:
-            import winreg
-            
-            key = winreg.OpenKey(
-                winreg.HKEY_CURRENT_USER,
-                r"Control Panel\Desktop",
-                0,
-                winreg.KEY_READ
-            )
-            
-            wallpaper, _ = winreg.QueryValueEx(key, "Wallpaper")
-            winreg.CloseKey(key)
-            
-            return wallpaper if wallpaper else None
-            
-        except Exception as e:
-            logger.warning(f"Impossible de récupérer le fond d'écran actuel: {e}")
-            return None
-    
-    def validate_image(self, image_path: str) -> bool:
-        """
-        Valide qu'une image est utilisable comme fond d'écran.
-        
-        Args:
-            image_path: Chemin de l'image
-            
-        Returns:
-            True si valide, False sinon
-        """
-        try:
-            if not os.path.exists(image_path):
-                return False
-            
-            # Vérifier que c'est une image valide
-            with Image.open(image_path) as img:
-                img.verify()
-            
-            return True
-            
-        except Exception as e:
-            logger.warning(f"Image invalide {image_path}: {e}")
-            return False
-    
-    def create_multi_screen_wallpaper(
-        self,
-        screens: list,
-        image_paths: Dict[int, str],
-        output_path: str
-    ) -> Optional[str]:
-        """
-        Crée une image composite pour gérer plusieurs écrans.
-        
-        Args:
-            screens: Liste des informations d'écrans
-            image_paths: Dictionnaire {screen_id: image_path}
-            output_path: Chemin de sortie de l'image composite
-            
-        Returns:
-            Chemin de l'image composite créée ou None
-        """
-        try:
-            # Calculer les bornes exactes selon les positions Windows
-            min_x = min(s['left'] for s in screens)
-            min_y = min(s['top'] for s in screens)
-            max_x = max(s['right'] for s in screens)
-            max_y = max(s['bottom'] for s in screens)
-            
-            total_width = max_x - min_x
-            total_height = max_y - min_y
-            
-            logger.info("=== CRÉATION FOND D'ÉCRAN MULTI-MONITEURS ===")
-            logger.info(f"Espace virtuel Windows : {total_width}x{total_height}")
-            for screen in screens:
-                width = screen['right'] - screen['left']
-                height = screen['bottom'] - screen['top']
-                logger.info(f"  Écran {screen['id']}: {width}x{height} à position ({screen['left']}, {screen['top']})")
-            
-            # Créer l'image composite avec les positions RÉELLES de Windows
-            composite = Image.new('RGB', (total_width, total_height), (0, 0, 0))
-            
-            # Placer chaque image à sa position EXACTE dans l'espace virtuel Windows
-            for screen in screens:
-                screen_id = screen['id']
-                if screen_id in image_paths:
-                    img_path = image_paths[screen_id]
-                    
-                    if os.path.exists(img_path):
-                        with Image.open(img_path) as img:
-                            screen_width = screen['right'] - screen['left']
-                            screen_height = screen['bottom'] - screen['top']
-                            
-                            # Redimensionner l'image en mode "fill" (couvrir tout l'écran)
-                            img_ratio = img.width / img.height
-                            screen_ratio = screen_width / screen_height
-                            
-                            if img_ratio > screen_ratio:
-                                # Image plus large : ajuster sur la hauteur
-                                new_height = screen_height
-                                new_width = int(new_height * img_ratio)
-                            else:
-                                # Image plus haute : ajuster sur la largeur
-                                new_width = screen_width
-                                new_height = int(new_width / img_ratio)
-                            
-                            img_resized = img.resize((new_width, new_height), Image.Resampling.LANCZOS)
-                            
-                            # Centrer et rogner
-                            left = (new_width - screen_width) // 2
-                            top = (new_height - screen_height) // 2
-                            img_cropped = img_resized.crop((left, top, left + screen_width, top + screen_height))
-                            
-                            # Placer à la position EXACTE de l'écran dans Windows
-                            x = screen['left'] - min_x
-                            y = screen['top'] - min_y
-                            composite.paste(img_cropped, (x, y))
-                            
-                            logger.info(f"  ✓ Image {screen_id} placée à ({x}, {y}), taille {screen_width}x{screen_height}")
-            
-            # Sauvegarder
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            composite.save(output_path, 'JPEG', quality=95)
-            
-            logger.info(f"✓ Composite créé : {output_path} ({total_width}x{total_height})")
-            logger.info("=" * 50)
-            return output_path
-            
-        except Exception as e:
-            logger.error(f"Erreur lors de la création de l'image composite: {e}", exc_info=True)
-            return None
-
-
+"""Module de gestion des fonds d'écran Windows."""
+
+import concurrent.futures
+import ctypes
+import functools
+import hashlib
+import os
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+from typing import Dict, Optional
+
+from ..utils.logger import get_logger
+
+logger = get_logger()
+
+# Les modules lourds (PIL, comtypes) sont importés paresseusement dans les
+# méthodes qui les utilisent: importer ce module ne paie que ctypes, ce qui
+# réduit nettement le démarrage à froid de l'application
+
+# Canevas numpy optionnel: la composition multi-écrans par affectation de
+# tranches est nettement plus rapide que les paste() Pillow, même sans
+# turbojpeg
+try:
+    import numpy as _np
+except Exception:
+    _np = None
+    logger.debug("numpy non disponible, composition du canevas via Pillow")
+
+# Encodeur JPEG optionnel basé sur libjpeg-turbo (SIMD): environ deux fois
+# plus rapide que l'encodeur Pillow sur les grands canevas multi-moniteurs.
+# Pillow reste le repli si turbojpeg n'est pas installé.
+try:
+    from turbojpeg import TJFLAG_FASTDCT, TJPF_RGB, TJSAMP_420, TurboJPEG
+    _turbo_jpeg = TurboJPEG()
+except Exception:
+    _turbo_jpeg = None
+    logger.debug("turbojpeg non disponible, encodage JPEG via Pillow")
+
+# Métadonnées d'une image validée: objet vrai/faux compatible avec les
+# appels qui testaient l'ancien booléen de validate_image
+ImageMeta = namedtuple('ImageMeta', 'width height format mtime')
+
+
+@functools.lru_cache(maxsize=1024)
+def _probe_image(image_path: str, mtime: float) -> Optional[ImageMeta]:
+    """
+    Sonde l'en-tête d'une image et mémoïse le résultat.
+
+    La clé inclut le mtime: un fichier remplacé est re-sondé, un fichier
+    inchangé revalidé (démarrage, reconstruction de playlist) ne coûte
+    qu'une recherche de cache.
+
+    Args:
+        image_path: Chemin de l'image
+        mtime: Date de modification du fichier
+
+    Returns:
+        ImageMeta (largeur, hauteur, format, mtime) ou None si invalide
+    """
+    try:
+        # Rejet rapide sur la signature: quelques octets lus au lieu du
+        # parcours complet du fichier que faisait Image.verify()
+        with open(image_path, 'rb') as image_file:
+            head = image_file.read(32)
+
+        if not (
+            head.startswith(b'\xff\xd8')                       # JPEG
+            or head.startswith(b'\x89PNG')                      # PNG
+            or head.startswith(b'GIF8')                         # GIF
+            or head.startswith(b'BM')                           # BMP
+            or (head.startswith(b'RIFF') and head[8:12] == b'WEBP')
+        ):
+            logger.warning(f"Image invalide {image_path}: signature inconnue")
+            return None
+
+        from PIL import Image
+
+        # Sonde d'en-tête: Pillow ne décode que les métadonnées, pas
+        # les pixels — il suffit que le fichier soit ouvrable
+        with Image.open(image_path) as img:
+            img.draft('RGB', (1, 1))
+            return ImageMeta(img.width, img.height, img.format, mtime)
+
+    except Exception as e:
+        logger.warning(f"Image invalide {image_path}: {e}")
+        return None
+
+
+def _fit_image_to_screen(img, screen_width: int, screen_height: int):
+    """
+    Recadre et redimensionne une image au format exact d'un écran (mode fill).
+
+    Args:
+        img: Image PIL ouverte
+        screen_width: Largeur de l'écran en pixels
+        screen_height: Hauteur de l'écran en pixels
+
+    Returns:
+        Image PIL RGB de taille (screen_width, screen_height)
+    """
+    from PIL import Image
+
+    # Décodage JPEG à échelle réduite (DCT natif 1/2, 1/4, 1/8) quand la
+    # source dépasse largement l'écran: la marge 2x garde assez de pixels
+    # pour le rééchantillonnage final. Sans effet sur les formats non JPEG.
+    img.draft('RGB', (screen_width * 2, screen_height * 2))
+
+    # Mode "fill": calculer le rectangle source qui couvre l'écran
+    # (recadrage centré), puis redimensionner ce rectangle directement à la
+    # taille de l'écran via le paramètre box de resize — une seule passe
+    # sur les pixels au lieu de resize surdimensionné + crop
+    img_ratio = img.width / img.height
+    screen_ratio = screen_width / screen_height
+
+    if img_ratio > screen_ratio:
+        # Image plus large : rogner à gauche/droite
+        src_height = img.height
+        src_width = img.height * screen_ratio
+        src_x = (img.width - src_width) / 2
+        src_y = 0.0
+    else:
+        # Image plus haute : rogner en haut/bas
+        src_width = img.width
+        src_height = img.width / screen_ratio
+        src_x = 0.0
+        src_y = (img.height - src_height) / 2
+
+    # Rééchantillonneur selon le facteur de réduction: au delà de 2x de
+    # réduction, HAMMING est indiscernable de LANCZOS sur un fond d'écran
+    # pour bien moins de CPU
+    scale = screen_width / src_width
+    resample = (
+        Image.Resampling.LANCZOS if scale > 0.5
+        else Image.Resampling.HAMMING
+    )
+
+    img_fitted = img.resize(
+        (screen_width, screen_height),
+        resample,
+        box=(src_x, src_y, src_x + src_width, src_y + src_height)
+    )
+    if img_fitted.mode != 'RGB':
+        img_fitted = img_fitted.convert('RGB')
+    return img_fitted
+
+
+def _render_screen_rgb(img_path: str, screen_width: int, screen_height: int) -> bytes:
+    """
+    Rend la tuile d'un écran et retourne ses pixels RGB bruts.
+
+    Exécuté dans un processus worker pour les très grosses sources: seuls
+    des bytes picklables traversent la frontière de processus.
+
+    Args:
+        img_path: Chemin de l'image source
+        screen_width: Largeur de l'écran en pixels
+        screen_height: Hauteur de l'écran en pixels
+
+    Returns:
+        Pixels RGB bruts de taille screen_width * screen_height * 3
+    """
+    from PIL import Image
+    with Image.open(img_path) as img:
+        return _fit_image_to_screen(img, screen_width, screen_height).tobytes()
+
+
+# Au-delà de ce volume cumulé de sources, le décodage passe par un pool de
+# processus: chaque worker décode avec libjpeg en parallèle sur son cœur
+_PROCESS_POOL_THRESHOLD_BYTES = 50_000_000
+
+# SystemParametersInfoW lié une fois avec ses types d'arguments explicites:
+# évite la résolution de user32, de l'export et l'inférence de types ctypes
+# à chaque application de fond d'écran
+_user32 = ctypes.WinDLL('user32', use_last_error=True)
+_SystemParametersInfoW = _user32.SystemParametersInfoW
+_SystemParametersInfoW.argtypes = (
+    ctypes.c_uint,     # uiAction
+    ctypes.c_uint,     # uiParam
+    ctypes.c_wchar_p,  # pvParam
+    ctypes.c_uint,     # fWinIni
+)
+_SystemParametersInfoW.restype = ctypes.c_int
+
+# CLSID de DesktopWallpaper (Windows 10+)
+_IDESKTOP_WALLPAPER_CLSID = "{C2CF3110-460E-4fc1-B9D0-8A1C0C9CC4BD}"
+
+# Interface comtypes construite au premier accès COM ("False" = indisponible)
+_idesktop_wallpaper_iface = None
+
+
+def _get_idesktop_interface():
+    """
+    Construit paresseusement l'interface comtypes IDesktopWallpaper.
+
+    L'import de comtypes et la génération de l'interface coûtent plusieurs
+    centaines de millisecondes: ils ne sont payés qu'au premier appel COM,
+    pas à l'import du module.
+
+    Returns:
+        Classe d'interface comtypes, ou None si comtypes est indisponible
+    """
+    global _idesktop_wallpaper_iface
+    if _idesktop_wallpaper_iface is not None:
+        return _idesktop_wallpaper_iface or None
+
+    try:
+        import comtypes
+        from comtypes import COMMETHOD, GUID, HRESULT
+        from ctypes import POINTER, c_uint, c_wchar_p
+        from ctypes.wintypes import DWORD, RECT
+
+        class IDesktopWallpaper(comtypes.IUnknown):
+            _iid_ = GUID("{B92B56A9-8B55-4E14-9A89-0199BBB6F93B}")
+            _methods_ = [
+                COMMETHOD([], HRESULT, 'SetWallpaper',
+                          (['in'], c_wchar_p, 'monitorID'),
+                          (['in'], c_wchar_p, 'wallpaper')),
+                COMMETHOD([], HRESULT, 'GetWallpaper',
+                          (['in'], c_wchar_p, 'monitorID'),
+                          (['out'], POINTER(c_wchar_p), 'wallpaper')),
+                COMMETHOD([], HRESULT, 'GetMonitorDevicePathAt',
+                          (['in'], c_uint, 'monitorIndex'),
+                          (['out'], POINTER(c_wchar_p), 'monitorID')),
+                COMMETHOD([], HRESULT, 'GetMonitorDevicePathCount',
+                          (['out'], POINTER(c_uint), 'count')),
+                COMMETHOD([], HRESULT, 'GetMonitorRECT',
+                          (['in'], c_wchar_p, 'monitorID'),
+                          (['out'], POINTER(RECT), 'displayRect')),
+                COMMETHOD([], HRESULT, 'SetBackgroundColor',
+                          (['in'], DWORD, 'color')),
+                COMMETHOD([], HRESULT, 'GetBackgroundColor',
+                          (['out'], POINTER(DWORD), 'color')),
+                COMMETHOD([], HRESULT, 'SetPosition',
+                          (['in'], c_uint, 'position')),
+                COMMETHOD([], HRESULT, 'GetPosition',
+                          (['out'], POINTER(c_uint), 'position')),
+                COMMETHOD([], HRESULT, 'SetSlideshow',
+                          (['in'], c_wchar_p, 'items')),
+                COMMETHOD([], HRESULT, 'GetSlideshow',
+                          (['out'], POINTER(c_wchar_p), 'items')),
+                COMMETHOD([], HRESULT, 'SetSlideshowOptions',
+                          (['in'], c_uint, 'options'),
+                          (['in'], c_uint, 'slideshowTick')),
+                COMMETHOD([], HRESULT, 'GetSlideshowOptions',
+                          (['out'], POINTER(c_uint), 'options'),
+                          (['out'], POINTER(c_uint), 'slideshowTick')),
+                COMMETHOD([], HRESULT, 'AdvanceSlideshow',
+                          (['in'], c_wchar_p, 'monitorID'),
+                          (['in'], c_uint, 'direction')),
+                COMMETHOD([], HRESULT, 'GetStatus',
+                          (['out'], POINTER(c_uint), 'state')),
+                COMMETHOD([], HRESULT, 'Enable',
+                          (['in'], c_uint, 'enable')),
+            ]
+
+        _idesktop_wallpaper_iface = IDesktopWallpaper
+        return IDesktopWallpaper
+
+    except ImportError:
+        logger.debug("comtypes non disponible")
+        _idesktop_wallpaper_iface = False
+        return None
+
+
+class WallpaperManager:
+    """Gestionnaire de fonds d'écran Windows."""
+    
+    # Styles d'affichage Windows
+    STYLE_FILL = 10  # Remplir
+    STYLE_FIT = 6    # Ajuster
+    STYLE_STRETCH = 2  # Étirer
+    STYLE_CENTER = 0   # Centrer
+    STYLE_TILE = 1     # Mosaïque
+    STYLE_SPAN = 22    # Étendre (multi-moniteurs)
+    
+    STYLE_MAP = {
+        'fill': STYLE_FILL,
+        'fit': STYLE_FIT,
+        'stretch': STYLE_STRETCH,
+        'center': STYLE_CENTER,
+        'tile': STYLE_TILE,
+        'span': STYLE_SPAN
+    }
+
+    # Table style -> (WallpaperStyle, TileWallpaper) écrite dans le registre
+    _STYLE_REG = {
+        STYLE_FILL: ("10", "0"),
+        STYLE_FIT: ("6", "0"),
+        STYLE_STRETCH: ("2", "0"),
+        STYLE_CENTER: ("0", "0"),
+        STYLE_TILE: ("0", "1"),
+        STYLE_SPAN: ("22", "0"),  # SPAN étend l'image sur tous les moniteurs
+    }
+    
+    def __init__(self, screen_detector=None):
+        """
+        Initialise le gestionnaire de fonds d'écran.
+
+        Args:
+            screen_detector: ScreenDetector partagé (créé paresseusement sinon)
+        """
+        self.SPI_SETDESKWALLPAPER = 20
+        self.SPIF_UPDATEINIFILE = 0x01
+        self.SPIF_SENDCHANGE = 0x02
+
+        # L'objet COM IDesktopWallpaper (Windows 10+) est créé au premier
+        # accès via la propriété desktop_wallpaper, pas à la construction
+        self._desktop_wallpaper = None
+        self._desktop_wallpaper_probed = False
+
+        # Objet COM et table des monitor ids par thread (les objets COM ne
+        # se partagent pas entre threads), plus cache court des écrans
+        self._tls = threading.local()
+        self._screen_detector = screen_detector
+        self._screens_cache: Optional[tuple] = None  # (timestamp, screens)
+        self._last_style: Optional[int] = None  # dernier style écrit au registre
+        self._monitor_map: Dict[int, tuple] = {}  # {screen_id: (monitor_id, device_name)}
+        self._canvas_cache: Optional[tuple] = None  # (clé géométrie, ndarray)
+
+    @property
+    def desktop_wallpaper(self):
+        """
+        Objet COM IDesktopWallpaper, créé paresseusement au premier accès.
+
+        Returns:
+            Objet COM ou None si l'API moderne n'est pas disponible
+        """
+        if not self._desktop_wallpaper_probed:
+            self._desktop_wallpaper_probed = True
+            interface = _get_idesktop_interface()
+            if interface is None:
+                logger.info("comtypes non installé, utilisation du mode composite")
+            else:
+                try:
+                    import comtypes.client
+                    from comtypes import GUID
+                    self._desktop_wallpaper = comtypes.client.CreateObject(
+                        GUID(_IDESKTOP_WALLPAPER_CLSID),
+                        interface=interface
+                    )
+                    logger.info("✓ API moderne IDesktopWallpaper disponible (multi-moniteurs natif)")
+                except Exception as e:
+                    logger.warning(f"API IDesktopWallpaper non disponible, utilisation du mode composite: {e}")
+        return self._desktop_wallpaper
+    
+    def set_wallpaper(
+        self,
+        image_path: str,
+        screen_id: Optional[int] = None,
+        fit_mode: str = 'fill',
+        is_composite: bool = False
+    ) -> bool:
+        """
+        Définit le fond d'écran.
+        
+        Args:
+            image_path: Chemin de l'image
+            screen_id: ID de l'écran (si None, applique à tous les écrans)
+            fit_mode: Mode d'ajustement ('fill', 'fit', 'stretch', 'center', 'tile', 'span')
+            is_composite: True si c'est une image composite multi-moniteurs
+            
+        Returns:
+            True si succès, False sinon
+        """
+        try:
+            # Un seul stat() vérifie l'existence; le nom de base est dérivé
+            # une fois pour les logs au lieu d'être recalculé plus bas
+            image_path = os.path.abspath(image_path)
+            try:
+                os.stat(image_path)
+            except OSError:
+                logger.error(f"Le fichier n'existe pas: {image_path}")
+                return False
+            image_name = os.path.basename(image_path)
+            
+            # Si API moderne disponible ET screen_id spécifié, utiliser IDesktopWallpaper
+            if self.desktop_wallpaper is not None and screen_id is not None:
+                return self._set_wallpaper_per_monitor(image_path, screen_id)
+            
+            # Sinon, utiliser l'API classique (tous les écrans)
+            # Pour un composite multi-moniteurs, forcer le mode "span"
+            if is_composite:
+                style_value = self.STYLE_SPAN
+                logger.info("Mode SPAN activé pour composite multi-moniteurs")
+            else:
+                style_value = self.STYLE_MAP.get(fit_mode, self.STYLE_FILL)
+            
+            self._set_wallpaper_style(style_value)
+            
+            # Appliquer le fond d'écran (fonction liée au chargement du module)
+            result = _SystemParametersInfoW(
+                self.SPI_SETDESKWALLPAPER,
+                0,
+                image_path,
+                self.SPIF_UPDATEINIFILE | self.SPIF_SENDCHANGE
+            )
+            
+            if result:
+                mode_name = "span" if is_composite else fit_mode
+                logger.info(f"Fond d'écran appliqué: {image_name} (mode: {mode_name})")
+                return True
+            else:
+                logger.error(f"Échec de l'application du fond d'écran: {image_path}")
+                return False
+                
+        except Exception as e:
+            logger.error(f"Erreur lors de l'application du fond d'écran: {e}", exc_info=True)
+            return False
+    
+    def _set_wallpaper_per_monitor(self, image_path: str, screen_id: int) -> bool:
+        """
+        Définit le fond d'écran pour un moniteur spécifique (Windows 10+).
+        
+        Args:
+            image_path: Chemin de l'image
+            screen_id: ID de l'écran
+            
+        Returns:
+            True si succès
+        """
+        try:
+            desktop_wallpaper, monitor_ids = self._get_thread_com()
+            if desktop_wallpaper is None:
+                logger.error("comtypes non disponible pour IDesktopWallpaper")
+                return False
+
+            if not self._monitor_map:
+                self._build_monitor_map(monitor_ids)
+
+            entry = self._monitor_map.get(screen_id)
+            if entry is None:
+                logger.error(f"Écran avec ID {screen_id} introuvable")
+                return False
+            monitor_id, device_name = entry
+
+            # Définir le fond d'écran pour ce moniteur (méthode liée mise en
+            # cache par _get_thread_com, sans redispatch comtypes)
+            self._tls.set_wallpaper_fn(monitor_id, image_path)
+
+            logger.info(f"✓ Fond d'écran appliqué sur écran {screen_id} ({device_name}): {os.path.basename(image_path)}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Erreur IDesktopWallpaper: {e}", exc_info=True)
+            # La topologie a pu changer (écran branché/débranché): repartir
+            # d'une énumération propre à la prochaine tentative
+            self.invalidate_monitor_map()
+            self._tls.dw = None
+            return False
+
+    def _build_monitor_map(self, monitor_ids: list) -> None:
+        """
+        Construit la table {screen_id: (monitor_id, device_name)}.
+
+        IMPORTANT : GetMonitorDevicePathAt() retourne les moniteurs dans
+        l'ordre DISPLAY1, DISPLAY2, DISPLAY3... (ordre alphabétique/trié)
+        qui correspond à notre screen_id après tri par device_name !
+        Donc on indexe directement par screen_id, pas par windows_index.
+
+        Args:
+            monitor_ids: Device paths retournés par l'interface COM
+        """
+        monitor_map = {}
+        for screen in self._get_screens_cached():
+            screen_id = screen['id']
+            if screen_id < len(monitor_ids):
+                monitor_map[screen_id] = (
+                    monitor_ids[screen_id],
+                    screen.get('device_name', 'Unknown')
+                )
+        self._monitor_map = monitor_map
+
+    def invalidate_monitor_map(self) -> None:
+        """Invalide la table écran -> moniteur (changement d'affichage)."""
+        self._monitor_map = {}
+        self._screens_cache = None
+
+    def _get_thread_com(self):
+        """
+        Récupère l'objet COM IDesktopWallpaper propre au thread courant.
+
+        CoInitialize + CreateObject + l'énumération des device paths ne
+        sont payés qu'une fois par thread: les appliques suivantes du
+        diaporama se réduisent au seul appel SetWallpaper.
+
+        Returns:
+            Tuple (objet COM, liste des monitor ids), ou (None, None)
+        """
+        desktop_wallpaper = getattr(self._tls, 'dw', None)
+        if desktop_wallpaper is not None:
+            return desktop_wallpaper, self._tls.monitor_ids
+
+        interface = _get_idesktop_interface()
+        if interface is None:
+            return None, None
+
+        # Initialiser COM pour ce thread si nécessaire
+        import pythoncom
+        try:
+            pythoncom.CoInitialize()
+            logger.debug("COM initialisé pour ce thread")
+        except Exception:
+            # Déjà initialisé, pas grave
+            pass
+
+        import comtypes.client
+        from comtypes import GUID
+        desktop_wallpaper = comtypes.client.CreateObject(
+            GUID(_IDESKTOP_WALLPAPER_CLSID),
+            interface=interface
+        )
+
+        # Lier les méthodes une seule fois: l'accès attribut comtypes
+        # repasse par les descripteurs générés à chaque appel, alors que la
+        # méthode liée mise en cache appelle directement le slot vtable
+        get_monitor_path = type(desktop_wallpaper).GetMonitorDevicePathAt.__get__(
+            desktop_wallpaper
+        )
+        monitor_ids = [
+            get_monitor_path(i)
+            for i in range(desktop_wallpaper.GetMonitorDevicePathCount())
+        ]
+        logger.debug(f"Nombre de moniteurs détectés par COM: {len(monitor_ids)}")
+
+        self._tls.dw = desktop_wallpaper
+        self._tls.monitor_ids = monitor_ids
+        self._tls.set_wallpaper_fn = type(desktop_wallpaper).SetWallpaper.__get__(
+            desktop_wallpaper
+        )
+        return desktop_wallpaper, monitor_ids
+
+    def _get_screens_cached(self) -> list:
+        """
+        Liste des écrans détectés, mémoïsée avec un TTL court (~5s).
+
+        Évite de reconstruire un ScreenDetector (et de ré-énumérer les
+        moniteurs Win32) à chaque application de fond d'écran.
+
+        Returns:
+            Liste des informations d'écrans
+        """
+        now = time.monotonic()
+        if self._screens_cache is not None and now - self._screens_cache[0] < 5.0:
+            return self._screens_cache[1]
+
+        from .screen_detector import ScreenDetector
+        if self._screen_detector is None:
+            self._screen_detector = ScreenDetector()
+        screens = self._screen_detector.detect_screens()
+        self._screens_cache = (now, screens)
+        return screens
+    
+    def _set_wallpaper_style(self, style: int) -> None:
+        """
+        Définit le style d'affichage du fond d'écran dans le registre Windows.
+        
+        Args:
+            style: Valeur du style
+        """
+        try:
+            # Court-circuit en mémoire: en diaporama le mode d'ajustement ne
+            # change pas, inutile même d'ouvrir la clé de registre
+            if style == self._last_style:
+                return
+
+            import winreg
+
+            key = winreg.OpenKey(
+                winreg.HKEY_CURRENT_USER,
+                r"Control Panel\Desktop",
+                0,
+                winreg.KEY_READ | winreg.KEY_SET_VALUE
+            )
+
+            # Valeurs précalculées dans la table de classe: une recherche
+            # de dict remplace la chaîne de if/elif
+            wallpaper_style, tile_wallpaper = self._STYLE_REG.get(
+                style, self._STYLE_REG[self.STYLE_FILL]
+            )
+
+            # N'écrire que les valeurs qui changent réellement: évite des
+            # transitions noyau superflues quand le style est déjà en place
+            try:
+                current_style, _ = winreg.QueryValueEx(key, "WallpaperStyle")
+            except OSError:
+                current_style = None
+            try:
+                current_tile, _ = winreg.QueryValueEx(key, "TileWallpaper")
+            except OSError:
+                current_tile = None
+
+            if current_style != wallpaper_style:
+                winreg.SetValueEx(key, "WallpaperStyle", 0, winreg.REG_SZ, wallpaper_style)
+            if current_tile != tile_wallpaper:
+                winreg.SetValueEx(key, "TileWallpaper", 0, winreg.REG_SZ, tile_wallpaper)
+
+            winreg.CloseKey(key)
+            self._last_style = style
+
+            logger.debug(f"Style de fond d'écran défini : {style}")
+            
+        except Exception as e:
+            logger.warning(f"Impossible de définir le style dans le registre: {e}")
+    
+    def get_current_wallpaper(self) -> Optional[str]:
+        """
+        Récupère le chemin du fond d'écran actuel.
+        
+        Returns:
+            Chemin du fond d'écran ou None
+        """
+        try:
+            import winreg
+            
+            key = winreg.OpenKey(
+                winreg.HKEY_CURRENT_USER,
+                r"Control Panel\Desktop",
+                0,
+                winreg.KEY_READ
+            )
+            
+            wallpaper, _ = winreg.QueryValueEx(key, "Wallpaper")
+            winreg.CloseKey(key)
+            
+            return wallpaper if wallpaper else None
+            
+        except Exception as e:
+            logger.warning(f"Impossible de récupérer le fond d'écran actuel: {e}")
+            return None
+    
+    def validate_image(self, image_path: str) -> Optional[ImageMeta]:
+        """
+        Valide qu'une image est utilisable comme fond d'écran.
+
+        Args:
+            image_path: Chemin de l'image
+
+        Returns:
+            ImageMeta (largeur, hauteur, format, mtime) si valide, None sinon
+        """
+        try:
+            mtime = os.path.getmtime(image_path)
+        except OSError as e:
+            logger.warning(f"Image invalide {image_path}: {e}")
+            return None
+        return _probe_image(image_path, mtime)
+    
+    @staticmethod
+    def _composite_cache_key(image_paths: Dict[int, str], screens: list) -> Optional[str]:
+        """
+        Calcule la clé de cache d'un composite (images + géométrie écrans).
+
+        La clé couvre le chemin, la date de modification et la taille de
+        chaque image source ainsi que les rectangles des écrans: un
+        composite déjà rendu pour ces mêmes entrées est réutilisable tel quel.
+
+        Args:
+            image_paths: Dictionnaire {screen_id: image_path}
+            screens: Liste des informations d'écrans
+
+        Returns:
+            Clé hexadécimale courte, ou None si une source est introuvable
+        """
+        try:
+            hasher = hashlib.blake2b(digest_size=16)
+            for screen_id in sorted(image_paths):
+                path = image_paths[screen_id]
+                stat = os.stat(path)
+                hasher.update(f"{screen_id}:{path}:{stat.st_mtime_ns}:{stat.st_size}".encode())
+            for screen in screens:
+                hasher.update(
+                    f"{screen['id']}:{screen['left']},{screen['top']},{screen['right']},{screen['bottom']}".encode()
+                )
+            return hasher.hexdigest()
+        except OSError:
+            return None
+
+    @staticmethod
+    def _cleanup_old_composites(output_dir: str) -> None:
+        """
+        Supprime les anciens composites mis en cache dans le dossier de sortie.
+
+        Conserve les 8 fichiers composite_*.jpg les plus récents pour garder
+        quelques rotations en cache sans laisser le dossier grossir.
+
+        Args:
+            output_dir: Dossier contenant les composites
+        """
+        try:
+            composites = sorted(
+                Path(output_dir).glob("composite_*.jpg"),
+                key=lambda p: p.stat().st_mtime
+            )
+            for old_file in composites[:-8]:
+                try:
+                    os.unlink(old_file)
+                except OSError:
+                    pass
+        except OSError:
+            pass
+
+    def create_multi_screen_wallpaper(
+        self,
+        screens: list,
+        image_paths: Dict[int, str],
+        output_path: str
+    ) -> Optional[str]:
+        """
+        Crée une image composite pour gérer plusieurs écrans.
+
+        Args:
+            screens: Liste des informations d'écrans
+            image_paths: Dictionnaire {screen_id: image_path}
+            output_path: Chemin de sortie de l'image composite
+
+        Returns:
+            Chemin de l'image composite créée ou None
+        """
+        try:
+            from PIL import Image
+
+            # Court-circuit: si ce jeu d'images/géométrie a déjà été rendu,
+            # réutiliser le JPEG existant sans repasser par PIL (la clé
+            # couvre mtime+taille des sources, un hit est donc à jour)
+            output_dir = os.path.dirname(output_path)
+            cache_key = self._composite_cache_key(image_paths, screens)
+            if cache_key:
+                cached_path = os.path.join(output_dir, f"composite_{cache_key}.jpg")
+                if os.path.exists(cached_path):
+                    logger.info(f"✓ Composite réutilisé depuis le cache: {cached_path}")
+                    return cached_path
+                output_path = cached_path
+
+            # Calculer les bornes exactes selon les positions Windows
+            min_x = min(s['left'] for s in screens)
+            min_y = min(s['top'] for s in screens)
+            max_x = max(s['right'] for s in screens)
+            max_y = max(s['bottom'] for s in screens)
+            
+            total_width = max_x - min_x
+            total_height = max_y - min_y
+            
+            logger.info("=== CRÉATION FOND D'ÉCRAN MULTI-MONITEURS ===")
+            logger.info(f"Espace virtuel Windows : {total_width}x{total_height}")
+            for screen in screens:
+                width = screen['right'] - screen['left']
+                height = screen['bottom'] - screen['top']
+                logger.info(f"  Écran {screen['id']}: {width}x{height} à position ({screen['left']}, {screen['top']})")
+            
+            # Créer le canevas composite avec les positions RÉELLES de
+            # Windows. Avec numpy, le canevas est un tableau uint8 contigu:
+            # chaque tuile y est posée par affectation de tranche (un seul
+            # memcpy C) et l'encodeur turbojpeg lit le tableau sans copie
+            if _np is not None:
+                # Réutiliser le tampon d'un appel précédent tant que la
+                # géométrie des écrans n'a pas changé: ~50 Mo d'allocation
+                # évités par rotation sur un canevas multi-moniteurs. Les
+                # zones de bordure entre écrans restent à zéro depuis la
+                # première allocation; les rectangles d'écran sont réécrits
+                # intégralement à chaque composition
+                geometry_key = (
+                    total_width,
+                    total_height,
+                    tuple(sorted(
+                        (s['left'], s['top'], s['right'], s['bottom']) for s in screens
+                    ))
+                )
+                if self._canvas_cache is not None and self._canvas_cache[0] == geometry_key:
+                    canvas = self._canvas_cache[1]
+                else:
+                    canvas = _np.zeros((total_height, total_width, 3), dtype=_np.uint8)
+                    self._canvas_cache = (geometry_key, canvas)
+                composite = None
+            else:
+                canvas = None
+                composite = Image.new('RGB', (total_width, total_height), (0, 0, 0))
+
+            def render_screen(task):
+                """Décode et ajuste l'image d'un écran (exécuté en worker)."""
+                screen, img_path = task
+                screen_width = screen['right'] - screen['left']
+                screen_height = screen['bottom'] - screen['top']
+
+                with Image.open(img_path) as img:
+                    img_fitted = _fit_image_to_screen(img, screen_width, screen_height)
+
+                # Position EXACTE de l'écran dans l'espace virtuel Windows
+                x = screen['left'] - min_x
+                y = screen['top'] - min_y
+                return screen['id'], x, y, screen_width, screen_height, img_fitted
+
+            # Chaque écran est indépendant et Pillow relâche le GIL pendant
+            # le décodage/redimensionnement: rendre les écrans en parallèle
+            tasks = [
+                (screen, image_paths[screen['id']])
+                for screen in screens
+                if screen['id'] in image_paths and os.path.exists(image_paths[screen['id']])
+            ]
+
+            try:
+                total_source_bytes = sum(
+                    os.path.getsize(img_path) for _, img_path in tasks
+                )
+            except OSError:
+                total_source_bytes = 0
+
+            if len(tasks) > 1 and total_source_bytes > _PROCESS_POOL_THRESHOLD_BYTES:
+                # Très grosses sources: un pool de processus contourne le GIL
+                # entièrement et décode sur plusieurs cœurs; seuls les pixels
+                # RGB bruts reviennent au parent
+                with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=min(4, os.cpu_count() or 1, len(tasks))
+                ) as executor:
+                    raw_tiles = list(executor.map(
+                        _render_screen_rgb,
+                        [img_path for _, img_path in tasks],
+                        [screen['right'] - screen['left'] for screen, _ in tasks],
+                        [screen['bottom'] - screen['top'] for screen, _ in tasks],
+                    ))
+                rendered = []
+                for (screen, _), raw in zip(tasks, raw_tiles):
+                    screen_width = screen['right'] - screen['left']
+                    screen_height = screen['bottom'] - screen['top']
+                    tile = Image.frombuffer(
+                        'RGB', (screen_width, screen_height), raw, 'raw', 'RGB', 0, 1
+                    )
+                    rendered.append((
+                        screen['id'],
+                        screen['left'] - min_x,
+                        screen['top'] - min_y,
+                        screen_width,
+                        screen_height,
+                        tile
+                    ))
+            elif len(tasks) > 1:
+                with concurrent.futures.ThreadPoolExecutor(
+                    max_workers=min(8, len(tasks))
+                ) as executor:
+                    rendered = list(executor.map(render_screen, tasks))
+            else:
+                rendered = [render_screen(task) for task in tasks]
+
+            # Assemblage séquentiel: seul le thread principal écrit le canevas
+            for screen_id, x, y, screen_width, screen_height, img_fitted in rendered:
+                if canvas is not None:
+                    canvas[y:y + screen_height, x:x + screen_width] = _np.asarray(img_fitted)
+                else:
+                    composite.paste(img_fitted, (x, y))
+                logger.info(f"  ✓ Image {screen_id} placée à ({x}, {y}), taille {screen_width}x{screen_height}")
+            
+            # Sauvegarder (écriture atomique: .tmp puis remplacement, pour ne
+            # jamais exposer un composite partiellement écrit dans le cache)
+            os.makedirs(output_dir, exist_ok=True)
+            tmp_path = output_path + '.tmp'
+            if canvas is not None and _turbo_jpeg is not None:
+                encoded = _turbo_jpeg.encode(
+                    canvas,
+                    quality=95,
+                    pixel_format=TJPF_RGB,
+                    jpeg_subsample=TJSAMP_420,
+                    flags=TJFLAG_FASTDCT
+                )
+                Path(tmp_path).write_bytes(encoded)
+            else:
+                if canvas is not None:
+                    # frombuffer référence le tableau au lieu de le copier
+                    composite = Image.frombuffer(
+                        'RGB', (total_width, total_height), canvas, 'raw', 'RGB', 0, 1
+                    )
+                composite.save(tmp_path, 'JPEG', quality=95)
+            os.replace(tmp_path, output_path)
+            self._cleanup_old_composites(output_dir)
+
+            logger.info(f"✓ Composite créé : {output_path} ({total_width}x{total_height})")
+            logger.info("=" * 50)
+            return output_path
+            
+        except Exception as e:
+            logger.error(f"Erreur lors de la création de l'image composite: {e}", exc_info=True)
+            return None
+
+
@@ -0,0 +1,143 @@
+"""Module de téléchargement asynchrone des images (aiohttp, optionnel)."""
+
+import asyncio
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+# aiohttp est une dépendance optionnelle: sans elle, le téléchargeur
+# classique à pool de threads (ImageDownloader.download_many) reste la
+# voie normale (installation: pip install aiohttp)
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from ..utils.logger import get_logger
+
+logger = get_logger()
+
+# Même table d'assainissement que le téléchargeur synchrone
+_SANITIZE_TABLE = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
+
+class AsyncImageDownloader:
+    """
+    Téléchargeur d'images basé sur une boucle asyncio.
+
+    Sur un gros scrape, le téléchargeur synchrone paie la latence réseau
+    requête par requête (borné par le nombre de threads du pool). Avec des
+    centaines de requêtes en vol sur une boucle d'événements, le temps mur
+    tend vers max(RTT) au lieu de sum(RTT), pour un surcoût CPU modeste.
+    """
+
+    def __init__(self, cache_dir: str = "data/cache",
+                 max_concurrent: int = 16,
+                 timeout_seconds: int = 30):
+        """
+        Initialise le téléchargeur asynchrone.
+
+        Args:
+            cache_dir: Dossier de cache des images
+            max_concurrent: Nombre maximum de requêtes simultanées par hôte
+            timeout_seconds: Timeout total par requête
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_concurrent = max_concurrent
+        self.timeout = timeout_seconds
+
+    @staticmethod
+    def available() -> bool:
+        """
+        Indique si aiohttp est installé.
+
+        Returns:
+            True si le téléchargement asynchrone est utilisable
+        """
+        return aiohttp is not None
+
+    async def _download_one(self, session, semaphore: asyncio.Semaphore,
+                            url: str, dest_path: Path) -> Optional[str]:
+        """
+        Télécharge une image vers un fichier.
+
+        Args:
+            session: Session aiohttp partagée
+            semaphore: Sémaphore limitant les requêtes en vol
+            url: URL de l'image
+            dest_path: Chemin de destination
+
+        Returns:
+            Chemin du fichier téléchargé ou None en cas d'erreur
+        """
+        async with semaphore:
+            try:
+                async with session.get(url) as response:
+                    response.raise_for_status()
+                    data = await response.read()
+            except aiohttp.ClientError as e:
+                logger.error(f"Erreur lors du téléchargement de {url}: {e}")
+                return None
+            except asyncio.TimeoutError:
+                logger.error(f"Timeout lors du téléchargement de {url}")
+                return None
+
+        # Écriture synchrone hors sémaphore: le réseau domine largement,
+        # write_bytes ne bloque la boucle que quelques millisecondes
+        try:
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            dest_path.write_bytes(data)
+        except OSError as e:
+            logger.error(f"Erreur lors de l'écriture de {dest_path.name}: {e}")
+            return None
+
+        logger.debug(f"✓ Image téléchargée: {dest_path.name}")
+        return str(dest_path)
+
+    async def download_all(
+        self, jobs: Iterable[Tuple[str, str, str]]
+    ) -> List[Optional[str]]:
+        """
+        Télécharge un lot d'images en parallèle sur la boucle d'événements.
+
+        Args:
+            jobs: Itérable de tuples (url, theme_name, filename)
+
+        Returns:
+            Liste des chemins téléchargés (None pour les échecs),
+            dans l'ordre des jobs
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        connector = aiohttp.TCPConnector(limit_per_host=self.max_concurrent)
+        timeout = aiohttp.ClientTimeout(total=self.timeout)
+
+        async with aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            headers={'User-Agent': 'Universe Wallpaper Manager/1.0'}
+        ) as session:
+            tasks = []
+            for url, theme_name, filename in jobs:
+                theme_dir = self.cache_dir / theme_name.translate(_SANITIZE_TABLE)
+                dest_path = theme_dir / filename.translate(_SANITIZE_TABLE)
+                tasks.append(
+                    self._download_one(session, semaphore, url, dest_path)
+                )
+            return await asyncio.gather(*tasks)
+
+    def download_all_sync(
+        self, jobs: Iterable[Tuple[str, str, str]]
+    ) -> List[Optional[str]]:
+        """
+        Enveloppe synchrone de download_all pour les appelants classiques.
+
+        Args:
+            jobs: Itérable de tuples (url, theme_name, filename)
+
+        Returns:
+            Liste des chemins téléchargés (None pour les échecs)
+        """
+        if aiohttp is None:
+            raise RuntimeError(
+                "aiohttp n'est pas installé. Exécutez: pip install aiohttp"
+            )
+        return asyncio.run(self.download_all(list(jobs)))
@@ -1,353 +1,832 @@
-"""Module de téléchargement et gestion du cache d'images."""
-
-import hashlib
-import json
-import os
-import shutil
-from datetime import datetime
-from pathlib import Path
-from typing import Dict, List, Optional
-
-import requests
-from PIL import Image
-
-from ..utils.logger import get_logger
-
-logger = get_logger()
-
-
-class ImageDownloader:
-    """Gestionnaire de téléchargement et cache d'images."""
-    
-    def __init__(
-        self,
-        cache_dir: str = "data/wallpapers",
-        cache_index_file: str = "data/cache_index.json"
-    ):
-        """
-        Initialise le gestionnaire de cache.
-        
-        Args:
-            cache_dir: Répertoire du cache
-            cache_index_file: Fichier d'index du cache
-        """
-        self.cache_dir = Path(cache_dir)
-        self.cache_index_file = Path(cache_index_file)
-        self.cache_index: Dict = {}
-        
-        # Créer les répertoires
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        self.cache_index_file.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Charger l'index
-        self.load_cache_index()
-    
-    def load_cache_index(self) -> None:
-        """Charge l'index du cache depuis le fichier."""
-        if self.cache_index_file.exists():
-            try:
-                with open(self.cache_index_file, 'r', encoding='utf-8') as f:
-                    self.cache_index = json.load(f)
-                logger.debug("Index du cache chargé")
-            except Exception as e:
-                logger.error(f"Erreur lors du chargement de l'index: {e}")
-                self.cache_index = self._create_empty_index()
-        else:
-            self.cache_index = self._create_empty_index()
-            self.save_cache_index()
-    
-    def save_cache_index(self) -> None:
-        """Sauvegarde l'index du cache dans le fichier."""
-        try:
-            with open(self.cache_index_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache_index, f, indent=2, ensure_ascii=False)
-            logger.debug("Index du cache sauvegardé")
-        except Exception as e:
-            logger.error(f"Erreur lors de la sauvegarde de l'index: {e}")
-    
-    def _create_empty_index(self) -> Dict:
-        """
-        Crée un index vide.
-        
-        Returns:
-            Structure d'index vide
-        """
-        return {
-            "themes": {},
-            "total_size": 0,
-            "last_update": datetime.now().isoformat()
-        }
-    
-    def download_image(
-        self,
-        url: str,
-        theme_name: str,
-        filename: Optional[str] = None,
-        force: bool = False
-    ) -> Optional[str]:
-        """
-        Télécharge une image et la met en cache.
-        
-        Args:
-            url: URL de l'image
-            theme_name: Nom du thème
-            filename: Nom du fichier (extrait de l'URL si None)
-            force: Forcer le téléchargement même si en cache
-            
-        Returns:
-            Chemin local de l'image ou None en cas d'erreur
-        """
-        if not filename:
-            filename = url.split('/')[-1].split('?')[0]
-        
-        # Nettoyer le nom du thème et du fichier
-        theme_name = self._sanitize_filename(theme_name)
-        filename = self._sanitize_filename(filename)
-        
-        # Créer le répertoire du thème
-        theme_dir = self.cache_dir / theme_name
-        theme_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Chemin local
-        local_path = theme_dir / filename
-        
-        # Vérifier si déjà en cache
-        if not force and local_path.exists():
-            logger.debug(f"Image déjà en cache: {filename}")
-            return str(local_path)
-        
-        # Télécharger
-        try:
-            logger.debug(f"Téléchargement de {filename} depuis {url}")
-            response = requests.get(url, timeout=30, stream=True)
-            response.raise_for_status()
-            
-            # Sauvegarder
-            with open(local_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-            
-            # Vérifier que c'est une image valide
-            try:
-                with Image.open(local_path) as img:
-                    img.verify()
-            except Exception as e:
-                logger.error(f"Image invalide téléchargée: {e}")
-                local_path.unlink(missing_ok=True)
-                return None
-            
-            # Mettre à jour l'index
-            file_size = local_path.stat().st_size
-            self._update_index(theme_name, filename, url, file_size)
-            
-            logger.info(f"Image téléchargée: {filename} ({file_size / 1024:.1f} KB)")
-            return str(local_path)
-            
-        except Exception as e:
-            logger.error(f"Erreur lors du téléchargement de {url}: {e}")
-            if local_path.exists():
-                local_path.unlink(missing_ok=True)
-            return None
-    
-    def _sanitize_filename(self, filename: str) -> str:
-        """
-        Nettoie un nom de fichier.
-        
-        Args:
-            filename: Nom à nettoyer
-            
-        Returns:
-            Nom nettoyé
-        """
-        # Remplacer les caractères interdits
-        invalid_chars = '<>:"/\\|?*'
-        for char in invalid_chars:
-            filename = filename.replace(char, '_')
-        
-        return filename
-    
-    def _update_index(self, theme_name: str, filename: str, url: str, size: int) -> None:
-        """
-        Met à jour l'index du cache.
-        
-        Args:
-            theme_name: Nom du thème
-            filename: Nom du fichier
-            url: URL de l'image
-            size: Taille du fichier
-        """
-        if theme_name not in self.cache_index['themes']:
-            self.cache_index['themes'][theme_name] = {
-                'last_update': datetime.now().isoformat(),
-                'images': []
-            }
-        
-        theme = self.cache_index['themes'][theme_name]
-        
-        # Vérifier si l'image existe déjà dans l'index
-        existing = next((img for img in theme['images'] if img['filename'] == filename), None)
-        
-        if existing:
-            # Mettre à jour
-            self.cache_index['total_size'] -= existing.get('size', 0)
-            existing['url'] = url
-            existing['size'] = size
-            existing['downloaded'] = True
-        else:
-            # Ajouter
-            theme['images'].append({
-                'filename': filename,
-                'url': url,
-                'size': size,
-                'downloaded': True
-            })
-        
-        self.cache_index['total_size'] += size
-        self.cache_index['last_update'] = datetime.now().isoformat()
-        theme['last_update'] = datetime.now().isoformat()
-        
-        self.save_cache_index()
-    
-    def get_cached_images(self, theme_name: Optional[str] = None) -> List[str]:
-        """
-        Récupère la liste des images en cache.
-        
-        Args:
-            theme_name: Nom du thème (tous si None)
-            
-        Returns:
-            Liste des chemins d'images
-        """
-        images = []
-        
-        if theme_name:
-            # Images d'un thème spécifique
-            theme_dir = self.cache_dir / theme_name
-            if theme_dir.exists():
-                for img_file in theme_dir.glob('*'):
-                    if img_file.is_file() and img_file.suffix.lower() in ['.jpg', '.jpeg', '.png', '.webp', '.bmp']:
-                        images.append(str(img_file))
-        else:
-            # Toutes les images
-            for theme_dir in self.cache_dir.iterdir():
-                if theme_dir.is_dir():
-                    for img_file in theme_dir.glob('*'):
-                        if img_file.is_file() and img_file.suffix.lower() in ['.jpg', '.jpeg', '.png', '.webp', '.bmp']:
-                            images.append(str(img_file))
-        
-        return images
-    
-    def get_cache_size(self) -> int:
-        """
-        Calcule la taille totale du cache.
-        
-        Returns:
-            Taille en octets
-        """
-        total_size = 0
-        
-        for theme_dir in self.cache_dir.iterdir():
-            if theme_dir.is_dir():
-                for img_file in theme_dir.rglob('*'):
-                    if img_file.is_file():
-                        total_size += img_file.stat().st_size
-        
-        return total_size
-    
-    def clear_cache(self, theme_name: Optional[str] = None) -> None:
-        """
-        Vide le cache.
-        
-        Args:
-            theme_name: Nom du thème à vider (tous si None)
-        """
-        try:
-            if theme_name:
-                # Vider un thème spécifique
-                theme_dir = self.cache_dir / theme_name
-                if theme_dir.exists():
-                    shutil.rmtree(theme_dir)
-                    logger.info(f"Cache du thème '{theme_name}' vidé")
-                
-                # Mettre à jour l'index
-                if theme_name in self.cache_index['themes']:
-                    theme_size = sum(img.get('size', 0) for img in self.cache_index['themes'][theme_name]['images'])
-                    self.cache_index['total_size'] -= theme_size
-                    del self.cache_index['themes'][theme_name]
-            else:
-                # Vider tout le cache
-                if self.cache_dir.exists():
-                    shutil.rmtree(self.cache_dir)
-                    self.cache_dir.mkdir(parents=True, exist_ok=True)
-                    logger.info("Cache complet vidé")
-                
-                self.cache_index = self._create_empty_index()
-            
-            self.save_cache_index()
-            
-        except Exception as e:
-            logger.error(f"Erreur lors du vidage du cache: {e}", exc_info=True)
-    
-    def cleanup_old_images(self, max_size_bytes: int) -> None:
-        """
-        Nettoie les anciennes images si le cache dépasse la taille maximale.
-        
-        Args:
-            max_size_bytes: Taille maximale en octets
-        """
-        current_size = self.get_cache_size()
-        
-        if current_size <= max_size_bytes:
-            logger.debug(f"Cache sous la limite ({current_size / 1024 / 1024:.1f} MB)")
-            return
-        
-        logger.info(f"Nettoyage du cache ({current_size / 1024 / 1024:.1f} MB > {max_size_bytes / 1024 / 1024:.1f} MB)")
-        
-        # Récupérer tous les fichiers avec leur date de modification
-        files = []
-        for theme_dir in self.cache_dir.iterdir():
-            if theme_dir.is_dir():
-                for img_file in theme_dir.glob('*'):
-                    if img_file.is_file():
-                        files.append({
-                            'path': img_file,
-                            'size': img_file.stat().st_size,
-                            'mtime': img_file.stat().st_mtime
-                        })
-        
-        # Trier par date (plus ancien en premier)
-        files.sort(key=lambda x: x['mtime'])
-        
-        # Supprimer les plus anciens jusqu'à atteindre la limite
-        for file_info in files:
-            if current_size <= max_size_bytes:
-                break
-            
-            try:
-                file_info['path'].unlink()
-                current_size -= file_info['size']
-                logger.debug(f"Supprimé: {file_info['path'].name}")
-            except Exception as e:
-                logger.error(f"Erreur lors de la suppression de {file_info['path']}: {e}")
-        
-        # Reconstruire l'index
-        self._rebuild_index()
-        
-        logger.info(f"Nettoyage terminé. Taille actuelle: {current_size / 1024 / 1024:.1f} MB")
-    
-    def _rebuild_index(self) -> None:
-        """Reconstruit l'index du cache à partir des fichiers présents."""
-        logger.debug("Reconstruction de l'index du cache")
-        
-        self.cache_index = self._create_empty_index()
-        
-        for theme_dir in self.cache_dir.iterdir():
-            if theme_dir.is_dir():
-                theme_name = theme_dir.name
-                
-                for img_file in theme_dir.glob('*'):
-                    if img_file.is_file():
-                        size = img_file.stat().st_size
-                        self._update_index(theme_name, img_file.name, "", size)
-
-
+"""Module de téléchargement et gestion du cache d'images."""
+
+import atexit
+import concurrent.futures
+import hashlib
+import json
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from PIL import Image
+
+from ..utils.logger import get_logger
+
+logger = get_logger()
+
+# Sérialisation JSON accélérée (orjson, encodeur C) pour l'index du cache,
+# avec repli sur le module json standard si orjson n'est pas installé
+try:
+    import orjson as _orjson
+except ImportError:
+    _orjson = None
+
+# Caractères interdits par Windows remplacés par '_' en une seule passe C
+_SANITIZE_TABLE = str.maketrans({char: '_' for char in '<>:"/\\|?*'})
+
+
+def _looks_like_image(head: bytes) -> bool:
+    """
+    Teste les signatures d'images connues sur les premiers octets.
+
+    Args:
+        head: Premiers octets du fichier (16 suffisent)
+
+    Returns:
+        True si la signature correspond à un format d'image supporté
+    """
+    return (
+        head.startswith(b'\xff\xd8\xff')                     # JPEG
+        or head.startswith(b'\x89PNG\r\n\x1a\n')              # PNG
+        or head.startswith(b'GIF8')                          # GIF
+        or head.startswith(b'BM')                            # BMP
+        or (head[:4] == b'RIFF' and head[8:12] == b'WEBP')   # WebP
+    )
+
+
+class ImageDownloader:
+    """Gestionnaire de téléchargement et cache d'images."""
+
+    # Extensions d'images reconnues dans le cache
+    IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.bmp')
+    
+    def __init__(
+        self,
+        cache_dir: str = "data/wallpapers",
+        cache_index_file: str = "data/cache_index.json"
+    ):
+        """
+        Initialise le gestionnaire de cache.
+        
+        Args:
+            cache_dir: Répertoire du cache
+            cache_index_file: Fichier d'index du cache
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_index_file = Path(cache_index_file)
+        self.cache_index: Dict = {}
+        self._index_lock = threading.Lock()  # protège l'index en téléchargement parallèle
+        self._dirty = False  # modifications d'index non écrites sur disque
+        self._dirty_count = 0
+        # Vrai tant que total_size de l'index reflète le disque: permet à
+        # get_cache_size de répondre sans parcourir l'arborescence
+        self._index_is_authoritative = False
+
+        # Session partagée avec pool de connexions: les connexions TCP/TLS
+        # sont réutilisées entre téléchargements (keep-alive) au lieu d'une
+        # négociation complète par image
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=16, pool_maxsize=32)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Créer les répertoires
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_index_file.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Charger l'index
+        self.load_cache_index()
+
+        # Carte inverse hash de contenu -> chemin local, pour dédupliquer
+        # par lien dur les images identiques sous des noms différents
+        self._hash_to_path: Dict[str, str] = {}
+        self._build_hash_map()
+
+        # File des mises à jour d'index: les workers réseau y déposent leurs
+        # résultats et repartent télécharger; un unique thread écrivain les
+        # applique et regroupe les écritures disque
+        self._update_queue: "queue.Queue" = queue.Queue()
+        self._index_writer = threading.Thread(
+            target=self._index_writer_loop,
+            daemon=True,
+            name="cache-index-writer"
+        )
+        self._index_writer.start()
+
+        # Filet de sécurité: écrire les modifications en attente à la sortie
+        atexit.register(self.flush)
+    
+    def load_cache_index(self) -> None:
+        """Charge l'index du cache depuis le fichier."""
+        if self.cache_index_file.exists():
+            try:
+                if _orjson is not None:
+                    self.cache_index = _orjson.loads(self.cache_index_file.read_bytes())
+                else:
+                    with open(self.cache_index_file, 'r', encoding='utf-8') as f:
+                        self.cache_index = json.load(f)
+                self._migrate_index()
+                self._index_is_authoritative = True
+                logger.debug("Index du cache chargé")
+            except Exception as e:
+                logger.error(f"Erreur lors du chargement de l'index: {e}")
+                self.cache_index = self._create_empty_index()
+        else:
+            self.cache_index = self._create_empty_index()
+            self.save_cache_index()
+    
+    def _get_entry(self, theme_name: str, filename: str) -> Optional[Dict]:
+        """
+        Accès O(1) à l'entrée d'index d'une image.
+
+        Args:
+            theme_name: Nom du thème
+            filename: Nom du fichier
+
+        Returns:
+            Dictionnaire de métadonnées ou None si absente de l'index
+        """
+        theme = self.cache_index.get('themes', {}).get(theme_name)
+        if theme is None:
+            return None
+        return theme.get('images', {}).get(filename)
+
+    def _build_hash_map(self) -> None:
+        """
+        Reconstruit la carte hash de contenu -> chemin depuis l'index.
+
+        Seules les entrées déjà hachées y figurent; les images téléchargées
+        par les anciennes versions s'y ajoutent à leur prochain passage.
+        """
+        self._hash_to_path = {}
+        for theme_name, theme in self.cache_index.get('themes', {}).items():
+            theme_dir = self.cache_dir / theme_name
+            for filename, entry in theme.get('images', {}).items():
+                content_hash = entry.get('hash')
+                if content_hash:
+                    self._hash_to_path[content_hash] = str(theme_dir / filename)
+
+    def _migrate_index(self) -> None:
+        """
+        Migre le schéma historique (liste d'images) vers le dict par filename.
+
+        Les anciennes versions stockaient theme['images'] en liste, ce qui
+        rendait chaque mise à jour linéaire. Conversion unique au chargement.
+        """
+        migrated = False
+        for theme in self.cache_index.get('themes', {}).values():
+            images = theme.get('images')
+            if isinstance(images, list):
+                theme['images'] = {
+                    img['filename']: {k: v for k, v in img.items() if k != 'filename'}
+                    for img in images
+                }
+                migrated = True
+        if migrated:
+            logger.info("Index du cache migré vers le schéma indexé par filename")
+            self.save_cache_index()
+
+    def save_cache_index(self) -> None:
+        """Sauvegarde l'index du cache dans le fichier (écriture atomique)."""
+        tmp_name = None
+        try:
+            # Écrire dans un fichier temporaire du même dossier puis le
+            # renommer: l'index sur disque est toujours complet, même si
+            # l'application est tuée en pleine écriture
+            if _orjson is not None:
+                payload = _orjson.dumps(self.cache_index, option=_orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(
+                    self.cache_index, indent=2, ensure_ascii=False
+                ).encode('utf-8')
+
+            with tempfile.NamedTemporaryFile(
+                'wb',
+                dir=self.cache_index_file.parent,
+                suffix='.tmp',
+                delete=False
+            ) as f:
+                tmp_name = f.name
+                f.write(payload)
+            os.replace(tmp_name, self.cache_index_file)
+            tmp_name = None
+            self._dirty = False
+            self._dirty_count = 0
+            logger.debug("Index du cache sauvegardé")
+        except Exception as e:
+            logger.error(f"Erreur lors de la sauvegarde de l'index: {e}")
+        finally:
+            if tmp_name:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+
+    def flush(self) -> None:
+        """Écrit l'index sur disque s'il a des modifications en attente."""
+        with self._index_lock:
+            if self._dirty:
+                self.save_cache_index()
+
+    def join(self) -> None:
+        """Attend l'application de toutes les mises à jour d'index en file."""
+        self._update_queue.join()
+        self.flush()
+
+    def _index_writer_loop(self) -> None:
+        """
+        Boucle du thread écrivain d'index (consommateur unique).
+
+        Dépile les mises à jour produites par les téléchargements et
+        regroupe les écritures disque (toutes les 64 mises à jour ou
+        toutes les ~2 secondes), sans jamais bloquer les workers réseau.
+        """
+        pending = 0
+        last_flush = time.monotonic()
+        while True:
+            try:
+                item = self._update_queue.get(timeout=2.0)
+            except queue.Empty:
+                item = None
+
+            if item is not None:
+                try:
+                    with self._index_lock:
+                        self._update_index_locked(*item)
+                    pending += 1
+                finally:
+                    self._update_queue.task_done()
+
+            now = time.monotonic()
+            if pending and (pending >= 64 or now - last_flush >= 2.0):
+                self.flush()
+                pending = 0
+                last_flush = now
+    
+    def _create_empty_index(self) -> Dict:
+        """
+        Crée un index vide.
+        
+        Returns:
+            Structure d'index vide
+        """
+        return {
+            "themes": {},
+            "total_size": 0,
+            "last_update": datetime.now().isoformat()
+        }
+    
+    def download_image(
+        self,
+        url: str,
+        theme_name: str,
+        filename: Optional[str] = None,
+        force: bool = False,
+        deep_verify: bool = False
+    ) -> Optional[str]:
+        """
+        Télécharge une image et la met en cache.
+        
+        Args:
+            url: URL de l'image
+            theme_name: Nom du thème
+            filename: Nom du fichier (extrait de l'URL si None)
+            force: Forcer le téléchargement même si en cache
+            deep_verify: Vérifier toute la structure via PIL (lent),
+                au lieu de la seule signature
+            
+        Returns:
+            Chemin local de l'image ou None en cas d'erreur
+        """
+        if not filename:
+            filename = url.split('/')[-1].split('?')[0]
+        
+        # Nettoyer le nom du thème et du fichier
+        theme_name = self._sanitize_filename(theme_name)
+        filename = self._sanitize_filename(filename)
+        
+        # Créer le répertoire du thème
+        theme_dir = self.cache_dir / theme_name
+        theme_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Chemin local
+        local_path = theme_dir / filename
+        
+        # Vérifier si déjà en cache
+        if not force and local_path.exists():
+            logger.debug(f"Image déjà en cache: {filename}")
+            return str(local_path)
+        
+        # Télécharger
+        try:
+            # GET conditionnel: si le serveur a fourni des validateurs lors
+            # du téléchargement initial, un re-téléchargement forcé d'un
+            # fichier inchangé ne coûte qu'un 304 (quelques centaines
+            # d'octets) au lieu de l'image entière
+            request_headers = {}
+            if local_path.exists():
+                entry = self._get_entry(theme_name, filename)
+                if entry:
+                    if entry.get('etag'):
+                        request_headers['If-None-Match'] = entry['etag']
+                    if entry.get('last_modified'):
+                        request_headers['If-Modified-Since'] = entry['last_modified']
+
+            logger.debug(f"Téléchargement de {filename} depuis {url}")
+            response = self.session.get(
+                url, timeout=30, stream=True, headers=request_headers
+            )
+            if response.status_code == 304:
+                logger.debug(f"Image inchangée côté serveur (304): {filename}")
+                return str(local_path)
+            response.raise_for_status()
+
+            # Sauvegarder en blocs de 1 Mo, en alimentant au passage un
+            # hachage de contenu: les octets sont déjà en main, le hachage
+            # ne coûte aucune E/S supplémentaire
+            response.raw.decode_content = True
+            hasher = hashlib.blake2b(digest_size=16)
+            raw_read = response.raw.read
+            with open(local_path, 'wb') as f:
+                while True:
+                    chunk = raw_read(1024 * 1024)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    hasher.update(chunk)
+            content_hash = hasher.hexdigest()
+            
+            # Vérifier la signature du fichier: 16 octets lus au lieu du
+            # re-parcours complet que faisait Image.verify()
+            with open(local_path, 'rb') as f:
+                head = f.read(16)
+            if not _looks_like_image(head):
+                logger.error(f"Image invalide téléchargée: signature inconnue ({filename})")
+                local_path.unlink(missing_ok=True)
+                return None
+
+            if deep_verify:
+                try:
+                    with Image.open(local_path) as img:
+                        img.verify()
+                except Exception as e:
+                    logger.error(f"Image invalide téléchargée: {e}")
+                    local_path.unlink(missing_ok=True)
+                    return None
+            
+            # Déduplication: si le même contenu existe déjà sous un autre
+            # nom, remplacer la copie fraîche par un lien dur (un seul jeu
+            # de blocs sur disque pour les doublons)
+            existing_path = self._hash_to_path.get(content_hash)
+            if existing_path and existing_path != str(local_path) \
+                    and os.path.exists(existing_path):
+                # Créer le lien sous un nom temporaire puis le substituer
+                # atomiquement: si le lien échoue (système de fichiers sans
+                # liens durs), la copie fraîche reste intacte
+                link_tmp = str(local_path) + '.lnk'
+                try:
+                    os.link(existing_path, link_tmp)
+                    os.replace(link_tmp, local_path)
+                    logger.debug(
+                        f"Contenu identique: {filename} lié à "
+                        f"{os.path.basename(existing_path)}"
+                    )
+                except OSError:
+                    # Système de fichiers sans liens durs: garder la copie
+                    try:
+                        os.unlink(link_tmp)
+                    except OSError:
+                        pass
+            else:
+                self._hash_to_path[content_hash] = str(local_path)
+
+            # Mise à jour d'index déléguée au thread écrivain: le worker
+            # réseau repart immédiatement sur le téléchargement suivant
+            file_size = local_path.stat().st_size
+            self._update_queue.put((
+                theme_name,
+                filename,
+                url,
+                file_size,
+                response.headers.get('ETag'),
+                response.headers.get('Last-Modified'),
+                content_hash
+            ))
+            
+            logger.info(f"Image téléchargée: {filename} ({file_size / 1024:.1f} KB)")
+            return str(local_path)
+            
+        except Exception as e:
+            logger.error(f"Erreur lors du téléchargement de {url}: {e}")
+            if local_path.exists():
+                local_path.unlink(missing_ok=True)
+            return None
+    
+    def download_many(self, jobs: List[Tuple[str, str, Optional[str]]]) -> List[Optional[str]]:
+        """
+        Télécharge un lot d'images en parallèle.
+
+        Le travail est purement limité par la latence réseau: recouvrir les
+        requêtes avec un pool de threads ramène le temps total de N x RTT à
+        environ N/16 x RTT.
+
+        Args:
+            jobs: Liste de tuples (url, theme_name, filename)
+
+        Returns:
+            Liste des chemins locaux (None pour les échecs), dans l'ordre des jobs
+        """
+        if not jobs:
+            return []
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(lambda job: self.download_image(*job), jobs))
+
+        # Attendre l'application des mises à jour puis une seule écriture
+        self.join()
+        return results
+
+    def _sanitize_filename(self, filename: str) -> str:
+        """
+        Nettoie un nom de fichier.
+        
+        Args:
+            filename: Nom à nettoyer
+            
+        Returns:
+            Nom nettoyé
+        """
+        # Remplacer les caractères interdits (une passe via str.translate)
+        return filename.translate(_SANITIZE_TABLE)
+    
+    def _update_index(
+        self,
+        theme_name: str,
+        filename: str,
+        url: str,
+        size: int,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        content_hash: Optional[str] = None
+    ) -> None:
+        """
+        Met à jour l'index du cache.
+        
+        Args:
+            theme_name: Nom du thème
+            filename: Nom du fichier
+            url: URL de l'image
+            size: Taille du fichier
+            etag: Validateur ETag renvoyé par le serveur
+            last_modified: Validateur Last-Modified renvoyé par le serveur
+            content_hash: Hachage blake2b du contenu du fichier
+        """
+        with self._index_lock:
+            self._update_index_locked(
+                theme_name, filename, url, size, etag, last_modified, content_hash
+            )
+
+    def _update_index_locked(
+        self,
+        theme_name: str,
+        filename: str,
+        url: str,
+        size: int,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        content_hash: Optional[str] = None
+    ) -> None:
+        """
+        Corps de _update_index, à appeler sous _index_lock.
+
+        Args:
+            theme_name: Nom du thème
+            filename: Nom du fichier
+            url: URL de l'image
+            size: Taille du fichier
+            etag: Validateur ETag renvoyé par le serveur
+            last_modified: Validateur Last-Modified renvoyé par le serveur
+            content_hash: Hachage blake2b du contenu du fichier
+        """
+        # Un seul horodatage par mise à jour (datetime.now + isoformat
+        # coûtaient trois appels par image)
+        now_iso = datetime.now().isoformat()
+
+        if theme_name not in self.cache_index['themes']:
+            self.cache_index['themes'][theme_name] = {
+                'last_update': now_iso,
+                'images': {}
+            }
+        
+        theme = self.cache_index['themes'][theme_name]
+
+        # Les images sont indexées par filename: accès O(1) au lieu du
+        # balayage linéaire de l'ancienne liste
+        existing = theme['images'].get(filename)
+
+        if existing:
+            # Mettre à jour
+            self.cache_index['total_size'] -= existing.get('size', 0)
+            existing['url'] = url
+            existing['size'] = size
+            existing['downloaded'] = True
+            if etag:
+                existing['etag'] = etag
+            if last_modified:
+                existing['last_modified'] = last_modified
+            if content_hash:
+                existing['hash'] = content_hash
+        else:
+            # Ajouter
+            entry = {
+                'url': url,
+                'size': size,
+                'downloaded': True
+            }
+            if etag:
+                entry['etag'] = etag
+            if last_modified:
+                entry['last_modified'] = last_modified
+            if content_hash:
+                entry['hash'] = content_hash
+            theme['images'][filename] = entry
+        
+        self.cache_index['total_size'] += size
+        self.cache_index['last_update'] = now_iso
+        theme['last_update'] = now_iso
+
+        # Sauvegarde différée: réécrire tout le JSON à chaque image rend un
+        # lot de N téléchargements quadratique. On marque l'index modifié et
+        # on ne l'écrit qu'au flush (fin de lot/sortie) ou tous les 64 ajouts
+        self._dirty = True
+        self._dirty_count += 1
+        if self._dirty_count >= 64:
+            self.save_cache_index()
+    
+    def get_cached_images(self, theme_name: Optional[str] = None) -> List[str]:
+        """
+        Récupère la liste des images en cache.
+        
+        Args:
+            theme_name: Nom du thème (tous si None)
+            
+        Returns:
+            Liste des chemins d'images
+        """
+        # os.scandir évite un stat() séparé par fichier: le type d'entrée
+        # vient du dirent retourné par le système
+        images = []
+
+        if theme_name:
+            # Images d'un thème spécifique
+            self._scan_theme_images(str(self.cache_dir / theme_name), images)
+        else:
+            # Toutes les images
+            try:
+                with os.scandir(self.cache_dir) as theme_entries:
+                    for theme_entry in theme_entries:
+                        if theme_entry.is_dir(follow_symlinks=False):
+                            self._scan_theme_images(theme_entry.path, images)
+            except OSError:
+                pass
+
+        return images
+
+    @classmethod
+    def _scan_theme_images(cls, theme_path: str, images: List[str]) -> None:
+        """
+        Ajoute à `images` les fichiers image d'un dossier de thème.
+
+        Args:
+            theme_path: Chemin du dossier de thème
+            images: Liste de chemins à compléter
+        """
+        try:
+            with os.scandir(theme_path) as entries:
+                for entry in entries:
+                    if (entry.is_file(follow_symlinks=False)
+                            and entry.name.lower().endswith(cls.IMAGE_EXTENSIONS)):
+                        images.append(entry.path)
+        except OSError:
+            pass
+    
+    def get_cache_size(self) -> int:
+        """
+        Calcule la taille totale du cache.
+        
+        Returns:
+            Taille en octets
+        """
+        # Chemin rapide: total_size est entretenu à chaque téléchargement,
+        # inutile de re-parcourir l'arborescence tant qu'il fait foi
+        if self._index_is_authoritative:
+            return self.cache_index.get('total_size', 0)
+        return self._dir_size(str(self.cache_dir))
+
+    @classmethod
+    def _dir_size(cls, path: str) -> int:
+        """
+        Taille cumulée d'un dossier, récursivement via os.scandir.
+
+        DirEntry met le stat() en cache depuis le dirent: environ deux fois
+        moins de syscalls que le couple rglob + stat par fichier.
+
+        Args:
+            path: Dossier à mesurer
+
+        Returns:
+            Taille totale en octets
+        """
+        total_size = 0
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_file(follow_symlinks=False):
+                        total_size += entry.stat(follow_symlinks=False).st_size
+                    elif entry.is_dir(follow_symlinks=False):
+                        total_size += cls._dir_size(entry.path)
+        except OSError:
+            pass
+        return total_size
+    
+
+    @staticmethod
+    def _dispose_dir(directory: Path) -> None:
+        """
+        Supprime un dossier sans bloquer l'appelant.
+
+        Le dossier est d'abord détaché par un rename atomique vers un
+        dossier-poubelle voisin (O(1), quel que soit le nombre de
+        fichiers), puis réellement supprimé par un thread d'arrière-plan.
+        Si le rename échoue, repli sur la suppression synchrone.
+
+        Args:
+            directory: Dossier à supprimer
+        """
+        trash = directory.parent / f".trash-{uuid.uuid4().hex}"
+        try:
+            os.rename(directory, trash)
+        except OSError:
+            shutil.rmtree(directory, ignore_errors=True)
+            return
+        threading.Thread(
+            target=shutil.rmtree,
+            args=(trash,),
+            kwargs={'ignore_errors': True},
+            daemon=True,
+            name="cache-trash"
+        ).start()
+
+    def clear_cache(self, theme_name: Optional[str] = None) -> None:
+        """
+        Vide le cache.
+        
+        Args:
+            theme_name: Nom du thème à vider (tous si None)
+        """
+        try:
+            if theme_name:
+                # Vider un thème spécifique (rename O(1), suppression différée)
+                theme_dir = self.cache_dir / theme_name
+                if theme_dir.exists():
+                    self._dispose_dir(theme_dir)
+                    logger.info(f"Cache du thème '{theme_name}' vidé")
+                
+                # Mettre à jour l'index sous verrou: le thread écrivain
+                # peut le modifier en parallèle
+                with self._index_lock:
+                    if theme_name in self.cache_index['themes']:
+                        theme_size = sum(
+                            img.get('size', 0)
+                            for img in self.cache_index['themes'][theme_name]['images'].values()
+                        )
+                        self.cache_index['total_size'] -= theme_size
+                        del self.cache_index['themes'][theme_name]
+
+                    # Purger les hachages pointant dans le dossier supprimé
+                    prefix = str(theme_dir) + os.sep
+                    self._hash_to_path = {
+                        h: p for h, p in self._hash_to_path.items()
+                        if not p.startswith(prefix)
+                    }
+
+                    self.save_cache_index()
+            else:
+                # Vider tout le cache (rename O(1), suppression différée)
+                if self.cache_dir.exists():
+                    self._dispose_dir(self.cache_dir)
+                    self.cache_dir.mkdir(parents=True, exist_ok=True)
+                    logger.info("Cache complet vidé")
+                
+                with self._index_lock:
+                    self.cache_index = self._create_empty_index()
+                    self._hash_to_path = {}
+                    self.save_cache_index()
+            
+        except Exception as e:
+            logger.error(f"Erreur lors du vidage du cache: {e}", exc_info=True)
+    
+    def cleanup_old_images(self, max_size_bytes: int) -> None:
+        """
+        Nettoie les anciennes images si le cache dépasse la taille maximale.
+        
+        Args:
+            max_size_bytes: Taille maximale en octets
+        """
+        current_size = self.get_cache_size()
+        
+        if current_size <= max_size_bytes:
+            logger.debug(f"Cache sous la limite ({current_size / 1024 / 1024:.1f} MB)")
+            return
+        
+        logger.info(f"Nettoyage du cache ({current_size / 1024 / 1024:.1f} MB > {max_size_bytes / 1024 / 1024:.1f} MB)")
+
+        # Une éviction va réellement avoir lieu: re-mesurer sur disque pour
+        # travailler sur des tailles exactes, et considérer l'index suspect
+        # tant que la reconstruction n'a pas eu lieu
+        self._index_is_authoritative = False
+        current_size = self._dir_size(str(self.cache_dir))
+        
+        # Récupérer tous les fichiers avec leur date de modification
+        # (un seul stat par fichier, servi par le cache de DirEntry)
+        files = []
+        try:
+            with os.scandir(self.cache_dir) as theme_entries:
+                for theme_entry in theme_entries:
+                    if theme_entry.is_dir(follow_symlinks=False):
+                        with os.scandir(theme_entry.path) as entries:
+                            for entry in entries:
+                                if entry.is_file(follow_symlinks=False):
+                                    stat = entry.stat(follow_symlinks=False)
+                                    files.append({
+                                        'path': Path(entry.path),
+                                        'size': stat.st_size,
+                                        'mtime': stat.st_mtime
+                                    })
+        except OSError:
+            pass
+        
+        # Trier par date (plus ancien en premier)
+        files.sort(key=lambda x: x['mtime'])
+        
+        # Supprimer les plus anciens jusqu'à atteindre la limite
+        for file_info in files:
+            if current_size <= max_size_bytes:
+                break
+            
+            try:
+                file_info['path'].unlink()
+                current_size -= file_info['size']
+                logger.debug(f"Supprimé: {file_info['path'].name}")
+            except Exception as e:
+                logger.error(f"Erreur lors de la suppression de {file_info['path']}: {e}")
+        
+        # Reconstruire l'index
+        self._rebuild_index()
+        
+        logger.info(f"Nettoyage terminé. Taille actuelle: {current_size / 1024 / 1024:.1f} MB")
+    
+    def _rebuild_index(self) -> None:
+        """
+        Reconstruit l'index du cache à partir des fichiers présents.
+
+        L'index est construit d'un bloc pendant le parcours scandir puis
+        publié et écrit en une seule fois: pas de passage par
+        _update_index (verrou + horodatage par fichier) ni d'écriture
+        JSON intermédiaire pendant la reconstruction.
+        """
+        logger.debug("Reconstruction de l'index du cache")
+
+        new_index = self._create_empty_index()
+        total_size = 0
+
+        try:
+            with os.scandir(self.cache_dir) as theme_entries:
+                for theme_entry in theme_entries:
+                    if theme_entry.is_dir(follow_symlinks=False):
+                        images = {}
+                        with os.scandir(theme_entry.path) as entries:
+                            for entry in entries:
+                                if entry.is_file(follow_symlinks=False):
+                                    size = entry.stat(follow_symlinks=False).st_size
+                                    images[entry.name] = {
+                                        'url': "",
+                                        'size': size,
+                                        'downloaded': True
+                                    }
+                                    total_size += size
+                        if images:
+                            new_index['themes'][theme_entry.name] = {
+                                'last_update': new_index['last_update'],
+                                'images': images
+                            }
+        except OSError:
+            return
+
+        new_index['total_size'] = total_size
+
+        with self._index_lock:
+            self.cache_index = new_index
+            self._build_hash_map()
+            self._index_is_authoritative = True
+            self.save_cache_index()
+
+
@@ -1,243 +1,344 @@
-"""Module de scraping du site Universe Photo Archive."""
-
-import re
-import time
-from typing import Dict, List, Optional
-from urllib.parse import urljoin, unquote
-
-import requests
-from bs4 import BeautifulSoup
-
-from ..utils.logger import get_logger
-
-logger = get_logger()
-
-
-class UniverseScraper:
-    """Scraper pour Universe Photo Archive."""
-    
-    BASE_URL = "https://universe-photo-archive.eu/wallpapers/"
-    
-    def __init__(self, rate_limit_seconds: float = 1.0, timeout_seconds: int = 10):
-        """
-        Initialise le scraper.
-        
-        Args:
-            rate_limit_seconds: Délai minimum entre chaque requête
-            timeout_seconds: Timeout des requêtes HTTP
-        """
-        self.rate_limit = rate_limit_seconds
-        self.timeout = timeout_seconds
-        self.last_request_time = 0
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Universe Wallpaper Manager/1.0'
-        })
-    
-    def _rate_limited_request(self, url: str) -> Optional[requests.Response]:
-        """
-        Effectue une requête HTTP avec rate limiting.
-        
-        Args:
-            url: URL à requêter
-            
-        Returns:
-            Réponse HTTP ou None en cas d'erreur
-        """
-        # Appliquer le rate limiting
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.rate_limit:
-            time.sleep(self.rate_limit - elapsed)
-        
-        try:
-            response = self.session.get(url, timeout=self.timeout)
-            self.last_request_time = time.time()
-            response.raise_for_status()
-            return response
-        except requests.RequestException as e:
-            logger.error(f"Erreur lors de la requête vers {url}: {e}")
-            return None
-    
-    def get_themes(self) -> List[Dict[str, str]]:
-        """
-        Récupère la liste des thèmes disponibles.
-        
-        Returns:
-            Liste de dictionnaires {'name': ..., 'url': ...}
-        """
-        logger.info("Récupération des thèmes depuis Universe Photo Archive")
-        
-        response = self._rate_limited_request(self.BASE_URL)
-        if not response:
-            logger.error("Impossible de récupérer la liste des thèmes")
-            return []
-        
-        try:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            themes = []
-            
-            # Directory Lister : chercher tous les liens
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                link_text = link.get_text(strip=True)
-                
-                # Ignorer les liens de navigation et système
-                if href in ['..', '/', '../', '?sort=name', '?sort=size', '?sort=date']:
-                    continue
-                
-                # Ignorer les liens vides
-                if not href or not link_text:
-                    continue
-                
-                # Ignorer les fichiers d'images directement listés
-                image_extensions = ('.jpg', '.jpeg', '.png', '.webp', '.bmp', '.gif')
-                if any(href.lower().endswith(ext) for ext in image_extensions):
-                    continue
-                
-                # Un dossier se termine généralement par / OU contient un texte sans extension
-                is_folder = href.endswith('/') or '.' not in href.split('/')[-1]
-                
-                if is_folder:
-                    # Nettoyer le nom du thème
-                    # 1. Enlever les parties entre parenthèses (traductions)
-                    theme_name = re.sub(r'\s*\([^)]*\)', '', link_text).strip()
-                    
-                    # 2. Enlever la date de modification (après le tiret cadratin —)
-                    # Format: "Earth—2025-04-06 09:35:07"
-                    theme_name = re.split(r'[—–-]\d{4}', theme_name)[0].strip()
-                    
-                    # 3. Nettoyer les caractères interdits par Windows: < > : " / \ | ? *
-                    invalid_chars = '<>:"/\\|?*'
-                    for char in invalid_chars:
-                        theme_name = theme_name.replace(char, '')
-                    
-                    # 4. Enlever les espaces multiples et les espaces en fin
-                    theme_name = ' '.join(theme_name.split())
-                    
-                    # Si le nom est vide après nettoyage, utiliser le href
-                    if not theme_name:
-                        # Extraire le nom du dossier depuis l'URL
-                        theme_name = href.rstrip('/').split('/')[-1]
-                        # Décoder l'URL
-                        theme_name = unquote(theme_name)
-                        # Nettoyer à nouveau
-                        theme_name = re.sub(r'\s*\([^)]*\)', '', theme_name).strip()
-                        for char in invalid_chars:
-                            theme_name = theme_name.replace(char, '')
-                    
-                    # Construire l'URL complète
-                    theme_url = urljoin(self.BASE_URL, href)
-                    if not theme_url.endswith('/'):
-                        theme_url += '/'
-                    
-                    themes.append({
-                        'name': theme_name,
-                        'url': theme_url,
-                        'original_name': link_text
-                    })
-                    
-                    logger.debug(f"Thème détecté: '{theme_name}' -> {theme_url}")
-            
-            logger.info(f"{len(themes)} thème(s) trouvé(s)")
-            for theme in themes:
-                logger.info(f"  ✓ {theme['name']}")
-            
-            return themes
-            
-        except Exception as e:
-            logger.error(f"Erreur lors du parsing des thèmes: {e}", exc_info=True)
-            return []
-    
-    def get_theme_images(self, theme_url: str) -> List[Dict[str, str]]:
-        """
-        Récupère la liste des images d'un thème.
-        
-        Args:
-            theme_url: URL du thème
-            
-        Returns:
-            Liste de dictionnaires {'filename': ..., 'url': ...}
-        """
-        logger.debug(f"Récupération des images depuis {theme_url}")
-        
-        response = self._rate_limited_request(theme_url)
-        if not response:
-            logger.error(f"Impossible de récupérer les images du thème: {theme_url}")
-            return []
-        
-        try:
-            soup = BeautifulSoup(response.text, 'html.parser')
-            images = []
-            
-            # Extensions d'images supportées
-            image_extensions = ('.jpg', '.jpeg', '.png', '.webp', '.bmp')
-            
-            for link in soup.find_all('a', href=True):
-                href = link['href']
-                
-                # Vérifier si c'est une image
-                if any(href.lower().endswith(ext) for ext in image_extensions):
-                    # Décoder le nom du fichier pour affichage
-                    filename = unquote(href.split('/')[-1])
-                    # Ne pas ré-encoder : le href est déjà correctement encodé par le serveur
-                    image_url = urljoin(theme_url, href)
-                    
-                    images.append({
-                        'filename': filename,
-                        'url': image_url
-                    })
-            
-            logger.debug(f"{len(images)} images trouvées dans le thème")
-            return images
-            
-        except Exception as e:
-            logger.error(f"Erreur lors du parsing des images: {e}", exc_info=True)
-            return []
-    
-    def get_all_themes_with_images(self) -> Dict[str, List[Dict[str, str]]]:
-        """
-        Récupère tous les thèmes avec leurs images.
-        
-        Returns:
-            Dictionnaire {theme_name: [images]}
-        """
-        logger.info("Récupération de tous les thèmes et images")
-        
-        themes = self.get_themes()
-        result = {}
-        
-        for theme in themes:
-            theme_name = theme['name']
-            theme_url = theme['url']
-            
-            images = self.get_theme_images(theme_url)
-            if images:
-                result[theme_name] = images
-        
-        total_images = sum(len(images) for images in result.values())
-        logger.info(f"Total: {len(result)} thèmes, {total_images} images")
-        
-        return result
-    
-    def test_connection(self) -> bool:
-        """
-        Test la connexion au site.
-        
-        Returns:
-            True si le site est accessible
-        """
-        logger.info("Test de connexion à Universe Photo Archive")
-        
-        try:
-            response = self.session.get(self.BASE_URL, timeout=5)
-            if response.status_code == 200:
-                logger.info("Connexion réussie")
-                return True
-            else:
-                logger.warning(f"Connexion échouée: HTTP {response.status_code}")
-                return False
-        except Exception as e:
-            logger.error(f"Impossible de se connecter: {e}")
-            return False
-
-
+"""Module de scraping du site Universe Photo Archive."""
+
+import concurrent.futures
+import re
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urljoin, unquote
+
+import requests
+from bs4 import BeautifulSoup, SoupStrainer
+
+from ..utils.logger import get_logger
+
+logger = get_logger()
+
+# Caractères interdits par Windows, supprimés en une seule passe C
+_STRIP_INVALID_TABLE = str.maketrans('', '', '<>:"/\\|?*')
+
+# Seules les ancres avec href nous intéressent: ne construire qu'elles
+# dans l'arbre BeautifulSoup au lieu du DOM complet
+_ONLY_ANCHORS = SoupStrainer('a', href=True)
+
+# Parseur lxml (C) si disponible, sinon le parseur Python de la stdlib
+try:
+    import lxml  # noqa: F401
+    _HTML_PARSER = 'lxml'
+except ImportError:
+    _HTML_PARSER = 'html.parser'
+
+# Triage des liens: extensions en tuples de module (str.endswith accepte
+# un tuple nativement) et liens de navigation dans un frozenset
+_IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.bmp')
+_LISTING_EXTENSIONS = _IMAGE_EXTENSIONS + ('.gif',)
+_NAV_LINKS = frozenset({'..', '/', '../', '?sort=name', '?sort=size', '?sort=date'})
+
+# Client httpx HTTP/2 si disponible: toutes les pages viennent de la même
+# origine, une connexion TLS multiplexée évite une poignée de main par
+# requête (installation optionnelle: pip install httpx[http2])
+try:
+    import httpx as _httpx
+    import h2  # noqa: F401 — requis par http2=True
+except ImportError:
+    _httpx = None
+
+# Erreurs réseau à intercepter selon le client retenu
+if _httpx is not None:
+    _REQUEST_ERRORS = (requests.RequestException, _httpx.HTTPError)
+else:
+    _REQUEST_ERRORS = (requests.RequestException,)
+
+# Réserve de dicts d'images recyclés entre deux scans: un re-scan qui
+# produit des listes identiques rend ses dicts ici au lieu de les laisser
+# au ramasse-miettes, et le scan suivant les réutilise
+_IMG_DICT_POOL: List[Dict] = []
+_IMG_DICT_POOL_MAX = 4096
+_img_pool_lock = threading.Lock()
+
+
+def recycle_image_dicts(images: List[Dict]) -> None:
+    """
+    Rend une liste de dicts d'images à la réserve pour réutilisation.
+
+    À n'appeler que sur des listes dont l'appelant est l'unique détenteur
+    (typiquement un résultat de get_theme_images qui ne sera pas conservé).
+
+    Args:
+        images: Liste de dicts à recycler (vidée sur place)
+    """
+    with _img_pool_lock:
+        space = _IMG_DICT_POOL_MAX - len(_IMG_DICT_POOL)
+        if space > 0:
+            _IMG_DICT_POOL.extend(images[:space])
+    images.clear()
+
+
+# Regex compilées une fois: get_themes les applique à chaque lien de la page
+_PARENS_RE = re.compile(r'\s*\([^)]*\)')
+_DATE_SPLIT_RE = re.compile(r'[—–-]\d{4}')
+
+
+class UniverseScraper:
+    """Scraper pour Universe Photo Archive."""
+    
+    BASE_URL = "https://universe-photo-archive.eu/wallpapers/"
+    
+    def __init__(self, rate_limit_seconds: float = 1.0, timeout_seconds: int = 10):
+        """
+        Initialise le scraper.
+        
+        Args:
+            rate_limit_seconds: Délai minimum entre chaque requête
+            timeout_seconds: Timeout des requêtes HTTP
+        """
+        self.rate_limit = rate_limit_seconds
+        self.timeout = timeout_seconds
+        # Prochain créneau de requête autorisé, partagé entre threads
+        self._next_request_time = 0.0
+        self._rate_lock = threading.Lock()
+        if _httpx is not None:
+            # HTTP/2: les rafales de pages partagent une connexion unique
+            self.session = _httpx.Client(
+                http2=True,
+                limits=_httpx.Limits(
+                    max_keepalive_connections=32,
+                    max_connections=64
+                ),
+                timeout=timeout_seconds,
+                headers={'User-Agent': 'Universe Wallpaper Manager/1.0'},
+                follow_redirects=True
+            )
+        else:
+            self.session = requests.Session()
+            self.session.headers.update({
+                'User-Agent': 'Universe Wallpaper Manager/1.0'
+            })
+    
+    def _rate_limited_request(self, url: str) -> Optional[requests.Response]:
+        """
+        Effectue une requête HTTP avec rate limiting.
+        
+        Args:
+            url: URL à requêter
+            
+        Returns:
+            Réponse HTTP ou None en cas d'erreur
+        """
+        # Appliquer le rate limiting: chaque thread réserve son créneau sous
+        # verrou puis dort hors verrou, ce qui espace les requêtes de
+        # rate_limit même avec plusieurs téléchargements en parallèle
+        with self._rate_lock:
+            now = time.time()
+            wait = self._next_request_time - now
+            self._next_request_time = max(now, self._next_request_time) + self.rate_limit
+        if wait > 0:
+            time.sleep(wait)
+
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            return response
+        except _REQUEST_ERRORS as e:
+            logger.error(f"Erreur lors de la requête vers {url}: {e}")
+            return None
+    
+    def get_themes(self) -> List[Dict[str, str]]:
+        """
+        Récupère la liste des thèmes disponibles.
+        
+        Returns:
+            Liste de dictionnaires {'name': ..., 'url': ...}
+        """
+        logger.info("Récupération des thèmes depuis Universe Photo Archive")
+        
+        response = self._rate_limited_request(self.BASE_URL)
+        if not response:
+            logger.error("Impossible de récupérer la liste des thèmes")
+            return []
+        
+        try:
+            soup = BeautifulSoup(response.text, _HTML_PARSER, parse_only=_ONLY_ANCHORS)
+            themes = []
+            
+            # Directory Lister : chercher tous les liens
+            for link in soup.find_all('a', href=True):
+                href = link['href']
+                link_text = link.get_text(strip=True)
+                
+                # Ignorer les liens de navigation et système
+                if href in _NAV_LINKS:
+                    continue
+                
+                # Ignorer les liens vides
+                if not href or not link_text:
+                    continue
+                
+                # Ignorer les fichiers d'images directement listés
+                # (un seul .lower() par lien, endswith sur tuple en C)
+                if href.lower().endswith(_LISTING_EXTENSIONS):
+                    continue
+                
+                # Un dossier se termine généralement par / OU contient un texte sans extension
+                is_folder = href.endswith('/') or '.' not in href.split('/')[-1]
+                
+                if is_folder:
+                    # Nettoyer le nom du thème
+                    # 1. Enlever les parties entre parenthèses (traductions)
+                    theme_name = _PARENS_RE.sub('', link_text).strip()
+                    
+                    # 2. Enlever la date de modification (après le tiret cadratin —)
+                    # Format: "Earth—2025-04-06 09:35:07"
+                    theme_name = _DATE_SPLIT_RE.split(theme_name)[0].strip()
+                    
+                    # 3. Nettoyer les caractères interdits par Windows: < > : " / \ | ? *
+                    theme_name = theme_name.translate(_STRIP_INVALID_TABLE)
+                    
+                    # 4. Enlever les espaces multiples et les espaces en fin
+                    theme_name = ' '.join(theme_name.split())
+                    
+                    # Si le nom est vide après nettoyage, utiliser le href
+                    if not theme_name:
+                        # Extraire le nom du dossier depuis l'URL
+                        theme_name = href.rstrip('/').split('/')[-1]
+                        # Décoder l'URL
+                        theme_name = unquote(theme_name)
+                        # Nettoyer à nouveau
+                        theme_name = _PARENS_RE.sub('', theme_name).strip()
+                        theme_name = theme_name.translate(_STRIP_INVALID_TABLE)
+                    
+                    # Construire l'URL complète
+                    theme_url = urljoin(self.BASE_URL, href)
+                    if not theme_url.endswith('/'):
+                        theme_url += '/'
+                    
+                    themes.append({
+                        'name': theme_name,
+                        'url': theme_url,
+                        'original_name': link_text
+                    })
+                    
+                    logger.debug(f"Thème détecté: '{theme_name}' -> {theme_url}")
+            
+            logger.info(f"{len(themes)} thème(s) trouvé(s)")
+            for theme in themes:
+                logger.info(f"  ✓ {theme['name']}")
+            
+            return themes
+            
+        except Exception as e:
+            logger.error(f"Erreur lors du parsing des thèmes: {e}", exc_info=True)
+            return []
+    
+    def get_theme_images(self, theme_url: str) -> List[Dict[str, str]]:
+        """
+        Récupère la liste des images d'un thème.
+        
+        Args:
+            theme_url: URL du thème
+            
+        Returns:
+            Liste de dictionnaires {'filename': ..., 'url': ...}
+        """
+        logger.debug(f"Récupération des images depuis {theme_url}")
+        
+        response = self._rate_limited_request(theme_url)
+        if not response:
+            logger.error(f"Impossible de récupérer les images du thème: {theme_url}")
+            return []
+        
+        try:
+            soup = BeautifulSoup(response.text, _HTML_PARSER, parse_only=_ONLY_ANCHORS)
+            images = []
+            
+            # Prendre la réserve locale en un seul passage sous verrou
+            with _img_pool_lock:
+                local_pool = _IMG_DICT_POOL[:]
+                _IMG_DICT_POOL.clear()
+            
+            for link in soup.find_all('a', href=True):
+                href = link['href']
+                
+                # Vérifier si c'est une image (endswith sur tuple en C)
+                if href.lower().endswith(_IMAGE_EXTENSIONS):
+                    # Décoder le nom du fichier pour affichage
+                    filename = unquote(href.split('/')[-1])
+                    # Ne pas ré-encoder : le href est déjà correctement encodé par le serveur
+                    image_url = urljoin(theme_url, href)
+                    
+                    if local_pool:
+                        entry = local_pool.pop()
+                        entry.clear()
+                        entry['filename'] = filename
+                        entry['url'] = image_url
+                    else:
+                        entry = {
+                            'filename': filename,
+                            'url': image_url
+                        }
+                    images.append(entry)
+            
+            # Rendre les dicts non utilisés à la réserve
+            if local_pool:
+                recycle_image_dicts(local_pool)
+            
+            logger.debug(f"{len(images)} images trouvées dans le thème")
+            return images
+            
+        except Exception as e:
+            logger.error(f"Erreur lors du parsing des images: {e}", exc_info=True)
+            return []
+    
+    def get_all_themes_with_images(self) -> Dict[str, List[Dict[str, str]]]:
+        """
+        Récupère tous les thèmes avec leurs images.
+        
+        Returns:
+            Dictionnaire {theme_name: [images]}
+        """
+        logger.info("Récupération de tous les thèmes et images")
+        
+        themes = self.get_themes()
+        result = {}
+
+        # Les pages de thèmes sont indépendantes: les récupérer en parallèle
+        # (le rate limiter espace les requêtes, mais le parsing et la latence
+        # réseau se recouvrent entre threads)
+        if themes:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+                futures = {
+                    theme['name']: executor.submit(self.get_theme_images, theme['url'])
+                    for theme in themes
+                }
+                for theme in themes:
+                    images = futures[theme['name']].result()
+                    if images:
+                        result[theme['name']] = images
+        
+        total_images = sum(len(images) for images in result.values())
+        logger.info(f"Total: {len(result)} thèmes, {total_images} images")
+        
+        return result
+    
+    def test_connection(self) -> bool:
+        """
+        Test la connexion au site.
+        
+        Returns:
+            True si le site est accessible
+        """
+        logger.info("Test de connexion à Universe Photo Archive")
+        
+        try:
+            response = self.session.get(self.BASE_URL, timeout=5)
+            if response.status_code == 200:
+                logger.info("Connexion réussie")
+                return True
+            else:
+                logger.warning(f"Connexion échouée: HTTP {response.status_code}")
+                return False
+        except Exception as e:
+            logger.error(f"Impossible de se connecter: {e}")
+            return False
+
+
@@ -0,0 +1,59 @@
+"""Cache des images d'interface (logos, icônes)."""
+
+from pathlib import Path
+from typing import Dict, Tuple
+
+import customtkinter as ctk
+
+# CTkImage déjà construites, par (chemin, taille): réafficher la bannière ou
+# recharger l'interface redevient une lecture de dict au lieu d'un décodage
+# PNG + rééchantillonnage LANCZOS
+_cache: Dict[Tuple[str, Tuple[int, int]], ctk.CTkImage] = {}
+
+# Dimensions naturelles des images, par chemin (lues dans l'en-tête PNG,
+# sans décoder les pixels)
+_size_cache: Dict[str, Tuple[int, int]] = {}
+
+
+def get_image_size(path: Path) -> Tuple[int, int]:
+    """
+    Récupère les dimensions naturelles d'une image (mémoïsé).
+
+    Args:
+        path: Chemin de l'image
+
+    Returns:
+        Tuple (largeur, hauteur)
+    """
+    key = str(path)
+    size = _size_cache.get(key)
+    if size is None:
+        from PIL import Image
+        with Image.open(path) as img:
+            size = img.size
+        _size_cache[key] = size
+    return size
+
+
+def get_ctk_image(path: Path, size: Tuple[int, int]) -> ctk.CTkImage:
+    """
+    Récupère une CTkImage redimensionnée, construite une seule fois.
+
+    Args:
+        path: Chemin de l'image
+        size: Taille d'affichage (largeur, hauteur)
+
+    Returns:
+        CTkImage prête à afficher
+    """
+    key = (str(path), size)
+    ctk_img = _cache.get(key)
+    if ctk_img is None:
+        from PIL import Image
+        img = Image.open(path)
+        img.load()
+        if size != img.size:
+            img = img.resize(size, Image.Resampling.LANCZOS)
+        ctk_img = ctk.CTkImage(light_image=img, dark_image=img, size=size)
+        _cache[key] = ctk_img
+    return ctk_img
@@ -216,6 +216,27 @@ class SmartCacheManager:
         
         return False
     
+    def get_displayed_set(self, theme_name: str) -> frozenset:
+        """
+        Récupère l'ensemble des noms de fichiers déjà affichés dans ce cycle.
+
+        Permet au planificateur de tester l'affichage en O(1) au lieu
+        d'appeler is_image_displayed (parcours linéaire) image par image.
+
+        Args:
+            theme_name: Nom du thème
+
+        Returns:
+            frozenset des filenames marqués comme affichés
+        """
+        theme_data = self.index['themes'].get(theme_name)
+        if not theme_data:
+            return frozenset()
+
+        return frozenset(
+            img['filename'] for img in theme_data['images'] if img.get('displayed')
+        )
+
     def mark_as_displayed(self, theme_name: str, image_path: str) -> None:
         """
         Marque une image comme affichée.